@@ -14,11 +14,36 @@ Author: Anton Vooren
 
 import os
 import sys
+import time
+import hashlib
+import tempfile
+import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, timezone
 
+# orjson står i requirements.txt: API-svarene parses med den (C-parser,
+# merkbart raskere på de store Frost- og Met.no-svarene). Importen er likevel
+# valgfri, slik at kjernen også virker i miljøer uten den (stdlib json).
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# pyarrow følger med streamlit. Da lagres diskcachen som Arrow IPC (Feather):
+# kolonnevis, uten pandas' blokkstruktur, og raskere å lese inn enn pickle.
+# Uten pyarrow (f.eks. en slank cron-installasjon) brukes pickle som før.
+try:
+    import pyarrow.feather  # noqa: F401
+    _HAVE_ARROW = True
+except ImportError:
+    _HAVE_ARROW = False
+
 # ============================================================================
 # CONSTANTS AND CONFIGURATION
 # ============================================================================
@@ -27,7 +52,7 @@ from datetime import datetime, timedelta, timezone
 # oppstart. Uten sjekken gir en delvis utrulling (ny app + gammel kjerne) bare
 # en sladdet NameError på Streamlit Cloud, som er nesten umulig å feilsøke.
 # Øk versjonen hver gang det legges til navn eller endres funksjonssignaturer.
-CORE_VERSION = "1.11.4"
+CORE_VERSION = "1.14.0"
 
 NVE_BASE_URL    = "https://hydapi.nve.no/api/v1"
 FROST_CLIENT_ID = "582507d2-434f-4578-afbd-919713bb3589"
@@ -393,20 +418,29 @@ def energy_percentile(e_mh, scale=None):
     Invers av energy_from_percentile(). Returnerer None for manglende eller
     ikke-numerisk verdi, slik at kallstedene kan skille «ingen data» fra
     «persentil 0». Verdier over referansemaksimum klippes til 100.
+
+    Tar også en array/Series og gir da en float-array i ett np.interp-kall,
+    med NaN der E mangler.
     """
     if e_mh is None:
         return None
+    s   = ENERGY_SOURCE_SCALE if scale is None else float(scale)
+    ref = [v * s for v in ENERGY_REF_MH]
+    if np.ndim(e_mh) > 0:
+        e = pd.to_numeric(np.asarray(e_mh).ravel(), errors='coerce').astype(float)
+        return np.clip(np.interp(e, ref, ENERGY_REF_PCTL), 0.0, 100.0)
     try:
         e = float(e_mh)
     except (TypeError, ValueError):
         return None
     if not np.isfinite(e):
         return None
-    s   = ENERGY_SOURCE_SCALE if scale is None else float(scale)
-    ref = [v * s for v in ENERGY_REF_MH]
     return float(np.clip(np.interp(e, ref, ENERGY_REF_PCTL), 0.0, 100.0))
 
 
+_PCTL_EDGES = np.array([ENERGY_PCTL_WARN, ENERGY_PCTL_ALARM])
+
+
 def energy_risk_level(e_mh, scale=None):
     """
     Klassifiserer E i 'lav' / 'advarsel' / 'alarm' etter persentil.
@@ -418,12 +452,8 @@ def energy_risk_level(e_mh, scale=None):
     pctl = energy_percentile(e_mh, scale=scale)
     if pctl is None:
         return {'level': None, 'pctl': None, 'e_mh': None}
-    if pctl >= ENERGY_PCTL_ALARM:
-        level = 'alarm'
-    elif pctl >= ENERGY_PCTL_WARN:
-        level = 'advarsel'
-    else:
-        level = 'lav'
+    level = ('lav', 'advarsel', 'alarm')[
+        int(np.searchsorted(_PCTL_EDGES, pctl, side='right'))]
     return {'level': level, 'pctl': round(pctl, 1), 'e_mh': float(e_mh)}
 
 
@@ -506,6 +536,14 @@ WIND_RISK_FADE_HOURS = 36.0   # t – utfasing etter vindrisiko-horisonten
 WIND_SIGMA_MULT_WARN    = 1.4     # KI-bredde-multiplikator når E > advarselsterskel
 WIND_SIGMA_MULT_ALARM   = 1.8     # KI-bredde-multiplikator når E > alarmterskel
 
+# Oppslagstabeller for risikonivå og multiplikator: nivået er et binærsøk mot
+# tersklene, multiplikatoren en lineær interpolasjon mellom knekkpunktene
+# (1 ved E = 0, flat over alarmterskelen). Virker likt for skalar og array.
+_RISK_LEVELS     = np.array(['lav', 'advarsel', 'alarm'])
+_ENERGY_EDGES_MH = np.array([ENERGY_WARN, ENERGY_THRESHOLD])
+_SIGMA_MULT_E    = np.array([0.0, ENERGY_WARN, ENERGY_THRESHOLD])
+_SIGMA_MULT_Y    = np.array([1.0, WIND_SIGMA_MULT_WARN, WIND_SIGMA_MULT_ALARM])
+
 # ── Seiche-ettereffekt konfigurasjon ─────────────────────────────────────────
 # Etter en bekreftet kald oppvellingsepisode ved Minnesund oscillerer
 # sprangsjiktet i Mjøsa med ~8–9 dagers halvperiode (Thendrup 1978).
@@ -533,78 +571,318 @@ EVENT_YEAR        = 2026
 EVENT_MONTH       = 8
 EVENT_DAY_OF_WEEK = 5   # lørdag
 
+# ── Diskcache for API-svar ───────────────────────────────────────────────────
+# st.cache_data lever bare i minnet til én prosess. Streamlit Cloud starter
+# containeren på nytt ved hver utrulling og etter inaktivitet, og da måtte
+# første besøkende vente på en full runde mot NVE og Met.no. De ferdig parsede
+# DataFrame-ene legges derfor også på disk. Settes GLOMMADYPPEN_CACHE_DIR til
+# en tom streng, er diskcachen av.
+#
+# En fil som leses fra disk, blir deretter liggende en hel ttl til i
+# minnecachen i appen. Godtok lasteren filer helt opp til ttl, kunne NVE/Frost
+# vises opptil ~2 t gamle og Met.no opptil ~12 t. Lasteren godtar derfor bare
+# filer yngre enn en fjerdedel av ttl, slik at verste fall er 1,25 × ttl.
+API_CACHE_DIR         = os.environ.get("GLOMMADYPPEN_CACHE_DIR", ".cache_api")
+API_CACHE_TTL_NVE     = 3600     # s – samme som @st.cache_resource i appen (også Frost)
+API_CACHE_TTL_WEATHER = 21600    # s – Met.no oppdaterer varselet ca. hver 6. t
+_DISK_CACHE_MAX_AGE_FRACTION = 0.25
+
+
+# ============================================================================
+# DISKCACHE
+# ============================================================================
+
+def _disk_cache_path(kind, *key_parts):
+    """Filsti for ett cachet API-svar, eller None når diskcachen er slått av."""
+    if not API_CACHE_DIR:
+        return None
+    key = "|".join(str(p) for p in key_parts)
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    ext = '.arrow' if _HAVE_ARROW else '.pkl'
+    return os.path.join(API_CACHE_DIR, f"{kind}_{digest}{ext}")
+
+
+def _disk_cache_load(path, ttl_s):
+    """
+    Leser en cachet DataFrame hvis filen finnes og er yngre enn en fjerdedel
+    av ttl_s (se _DISK_CACHE_MAX_AGE_FRACTION).
+    """
+    if path is None:
+        return None
+    try:
+        if time.time() - os.path.getmtime(path) > ttl_s * _DISK_CACHE_MAX_AGE_FRACTION:
+            return None
+        if path.endswith('.arrow'):
+            return pd.read_feather(path)
+        return pd.read_pickle(path)
+    except Exception:
+        # Manglende eller ødelagt fil er bare en cache-bom - hent på nytt.
+        return None
+
+
+_disk_cache_last_prune = 0.0   # time.time() ved siste opprydding
+
+
+def _disk_cache_store(path, df):
+    """
+    Skriver en DataFrame til diskcachen. Tomme svar lagres ikke: en kort
+    NVE-utkobling skal ikke låse appen til «ingen data» i en hel time.
+    """
+    global _disk_cache_last_prune
+    if path is None or df is None or df.empty:
+        return
+    try:
+        os.makedirs(API_CACHE_DIR, exist_ok=True)
+        # Rydd bort svar som har gått ut, høyst én gang per API_CACHE_TTL_WEATHER.
+        # Nøkler med varierende hours_back (treffsikkerhetssiden bytter nøkkel
+        # hver time) overskrives aldri, og en prosess som kjører lenge ville
+        # ellers fylle katalogen til neste omstart. Første lagring rydder alltid.
+        now = time.time()
+        if now - _disk_cache_last_prune > API_CACHE_TTL_WEATHER:
+            _disk_cache_last_prune = now
+            clear_disk_cache(max_age_s=max(API_CACHE_TTL_NVE, API_CACHE_TTL_WEATHER))
+        # Skriv til temp-fil og bytt inn atomisk, så en samtidig leser aldri
+        # ser en halvskrevet fil.
+        fd, tmp = tempfile.mkstemp(dir=API_CACHE_DIR, suffix='.tmp')
+        os.close(fd)
+        if path.endswith('.arrow'):
+            df.reset_index(drop=True).to_feather(tmp)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"[glommadyppen_core] Kunne ikke skrive diskcache: {e}", file=sys.stderr)
+
+
+def clear_disk_cache(max_age_s=None):
+    """
+    Sletter cachede API-svar på disk. Returnerer antall slettede filer.
+
+    Med `max_age_s` slettes bare filer som er eldre enn det (utløpte svar),
+    ellers alt.
+    """
+    if not API_CACHE_DIR or not os.path.isdir(API_CACHE_DIR):
+        return 0
+    now = time.time()
+    n = 0
+    for name in os.listdir(API_CACHE_DIR):
+        if name.endswith(('.arrow', '.pkl', '.tmp')):
+            path = os.path.join(API_CACHE_DIR, name)
+            try:
+                if max_age_s is not None and now - os.path.getmtime(path) <= max_age_s:
+                    continue
+                os.remove(path)
+                n += 1
+            except OSError:
+                pass
+    return n
+
 
 # ============================================================================
 # DATA FETCHING
 # ============================================================================
 
+# Én delt Session for alle API-kall: TCP/TLS-forbindelsene til NVE, Frost og
+# Met.no holdes åpne mellom hentingene (keep-alive) i stedet for et nytt
+# håndtrykk per kall. Poolen er like stor som fetch_concurrently() sitt
+# standard antall tråder. Forbigående 5xx-feil og 429 (rate limit hos Frost og
+# Met.no) prøves på nytt to ganger med kort backoff. Retry-After følges IKKE:
+# urllib3 sover ellers så lenge serveren ber om, uten øvre grense og utenfor
+# timeout-en, og ett 429-svar kunne fryse siden, holde en arbeidertråd i
+# fetch_concurrently() og stanse cron-kjøringen. Lesefeil prøves ikke på nytt
+# og tilkoblingsfeil bare én gang: et endepunkt som henger, skal koste ett
+# timeout=30, ikke tre pluss backoff.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, connect=1, read=0, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      respect_retry_after_header=False,
+                      raise_on_status=False),
+))
+_session.headers['Accept-Encoding'] = 'gzip, deflate'
+# Met.no krever en identifiserende User-Agent; den settes på sesjonen slik at
+# også NVE og Frost ser hvem som spør.
+_session.headers['User-Agent'] = 'GlommaDyppenApp/1.0 stevne@fetsk.no'
+
+
+def _parse_json(response):
+    """response.json(), men med orjson når den er tilgjengelig."""
+    if _orjson is not None:
+        return _orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def _shrink(df):
+    """
+    Nedskalerer numeriske kolonner: float64 → float32, heltall → minste
+    heltallstype. Sensorverdiene har langt færre gjeldende siffer enn float32
+    rommer, og cachede rammer tar da en brøkdel av plassen i minne, pickle og
+    Arrow. Modellkoden som trenger float64-presisjon, konverterer selv.
+    """
+    for col in df.columns:
+        kind = df[col].dtype.kind
+        if kind == 'f' and df[col].dtype != np.float32:
+            df[col] = df[col].astype(np.float32)
+        elif kind in 'iu':
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def _nve_empty():
+    return pd.DataFrame(columns=['time', 'value', 'quality'])
+
+
+def _nve_request(station_ids, parameter, hours_back, api_key):
+    """
+    Ett GET mot HydAPI /Observations. HydAPI tar en kommaseparert liste med
+    stasjoner i StationId og svarer med én serie per stasjon i 'data'.
+    """
+    url = f"{NVE_BASE_URL}/Observations"
+    headers = ({"X-API-Key": api_key, "accept": "application/json"}
+               if api_key else {"accept": "application/json"})
+    end_dt   = datetime.now(timezone.utc)
+    start_dt = end_dt - timedelta(hours=hours_back)
+    params = {
+        "StationId":      ",".join(station_ids),
+        "Parameter":      str(parameter),
+        "ResolutionTime": "60",
+        "ReferenceTime":  (
+            f"{start_dt.strftime('%Y-%m-%dT%H:%M:%SZ')}/"
+            f"{end_dt.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        ),
+    }
+    response = _session.get(url, headers=headers, params=params, timeout=30)
+    response.raise_for_status()
+    return _parse_json(response).get('data') or []
+
+
+def _nve_frame(observations, parameter, hours_back):
+    """Observasjonslisten for én serie → renset, sortert og nedskalert ramme."""
+    if not observations:
+        return _nve_empty()
+
+    # Kolonnene trekkes rett ut av JSON-listen og bygges som typede arrays.
+    # Tidligere ble det først laget en DataFrame av dict-objekter (object-
+    # kolonner), og deretter parset og filtrert kolonne for kolonne.
+    keys = set().union(*(o.keys() for o in observations))
+    if 'time' not in keys or 'value' not in keys:
+        return _nve_empty()
+
+    # Tidssonen normaliseres ÉN gang her, ved inntak: alle serier fra
+    # fetch_nve_data er tz-aware UTC, så analysefunksjonene slipper å
+    # sjekke og lokalisere på nytt for hvert kall.
+    times = pd.to_datetime([o.get('time') for o in observations],
+                           utc=True, format='ISO8601')
+    v = np.array([o.get('value') for o in observations], dtype=np.float64)
+    end_time = pd.Timestamp.now(tz='UTC')
+
+    # Alle filtrene slås sammen til ÉN boolsk maske over numpy-arrayene,
+    # i stedet for tre-fire mellomliggende DataFrame-kopier og en
+    # hash-basert isin() på kvalitetskoden.
+    mask = np.asarray(times >= end_time - pd.Timedelta(hours=hours_back))
+
+    has_quality = 'quality' in keys
+    if has_quality:
+        q = np.array([o.get('quality') for o in observations], dtype=np.float64)
+        mask &= (q >= 0) & (q <= 2) & (q == np.floor(q))
+
+    # Fysisk områdefilter. NVEs kvalitetskoder fanger ikke alle sensorfeil -
+    # Svanefoss har f.eks. levert ~-20.78 °C med kvalitetskode 1 (2021).
+    if parameter == 1003:
+        mask &= (v > 0.0) & (v < 35.0)
+    elif parameter == 1001:
+        mask &= (v >= DISCHARGE_MIN_VALID) & (v <= DISCHARGE_MAX_VALID)
+
+    idx = np.flatnonzero(mask)
+    idx = idx[np.argsort(np.asarray(times[idx]), kind='stable')]
+    df = pd.DataFrame({
+        'time':    times[idx],
+        'value':   v[idx],
+        'quality': q[idx].astype(np.int8) if has_quality else None,
+    })
+    return _shrink(df)
+
+
 def fetch_nve_data(station_id, parameter, hours_back=168, api_key=None):
     """
     Henter data fra NVE HydAPI.
     Parameter-koder: 1001 = vassføring (m³/s), 1003 = vanntemperatur (°C)
     """
     api_key = api_key or os.environ.get("NVE_API_KEY")
+    cache_path = _disk_cache_path('nve', station_id, parameter, hours_back)
+    cached = _disk_cache_load(cache_path, API_CACHE_TTL_NVE)
+    if cached is not None:
+        return cached
     try:
-        url = f"{NVE_BASE_URL}/Observations"
-        headers = ({"X-API-Key": api_key, "accept": "application/json"}
-                   if api_key else {"accept": "application/json"})
-        end_dt   = datetime.now(timezone.utc)
-        start_dt = end_dt - timedelta(hours=hours_back)
-        params = {
-            "StationId":      station_id,
-            "Parameter":      str(parameter),
-            "ResolutionTime": "60",
-            "ReferenceTime":  (
-                f"{start_dt.strftime('%Y-%m-%dT%H:%M:%SZ')}/"
-                f"{end_dt.strftime('%Y-%m-%dT%H:%M:%SZ')}"
-            ),
-        }
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-
-        if not (data.get('data') and len(data['data']) > 0):
-            return pd.DataFrame(columns=['time', 'value', 'quality'])
-        observations = data['data'][0].get('observations')
-        if not observations:
-            return pd.DataFrame(columns=['time', 'value', 'quality'])
-
-        df = pd.DataFrame(observations)
-        if 'time' not in df.columns or 'value' not in df.columns:
-            return pd.DataFrame(columns=['time', 'value', 'quality'])
-
-        df['time'] = pd.to_datetime(df['time'])
-        end_time   = pd.Timestamp.now(tz='UTC')
-        df = df[df['time'] >= end_time - pd.Timedelta(hours=hours_back)]
-
-        if 'quality' in df.columns:
-            df = df[df['quality'].isin([0, 1, 2])]
-
-        # Fysisk områdefilter. NVEs kvalitetskoder fanger ikke alle sensorfeil -
-        # Svanefoss har f.eks. levert ~-20.78 °C med kvalitetskode 1 (2021).
-        if parameter == 1003:
-            df = df[(df['value'] > 0.0) & (df['value'] < 35.0)]
-        elif parameter == 1001:
-            df = df[(df['value'] >= DISCHARGE_MIN_VALID) &
-                    (df['value'] <= DISCHARGE_MAX_VALID)]
-
-        df = df.sort_values('time').reset_index(drop=True)
-        for col in ['time', 'value', 'quality']:
-            if col not in df.columns:
-                df[col] = None
-        return df[['time', 'value', 'quality']]
+        series = _nve_request([station_id], parameter, hours_back, api_key)
+        if not series:
+            return _nve_empty()
+        df = _nve_frame(series[0].get('observations'), parameter, hours_back)
+        _disk_cache_store(cache_path, df)
+        return df
 
     except requests.exceptions.HTTPError:
-        return pd.DataFrame(columns=['time', 'value', 'quality'])
+        return _nve_empty()
     except Exception as e:
         if 'time' not in str(e):
             print(f"[glommadyppen_core] Datafeil stasjon {station_id}: "
                   f"{str(e)[:100]}", file=sys.stderr)
-        return pd.DataFrame(columns=['time', 'value', 'quality'])
+        return _nve_empty()
+
+
+def fetch_nve_batch(station_ids, parameter, hours_back=168, api_key=None):
+    """
+    Som fetch_nve_data, men for flere stasjoner med samme parameter i ÉN
+    forespørsel. Returnerer {station_id: DataFrame}.
+
+    Bare stasjonene som ikke ligger i diskcachen, hentes, og de lagres under
+    samme nøkkel som fetch_nve_data bruker, så de to deler cache. Manglende
+    serier i svaret og feil gir tomme rammer, som for enkelthentingen - også
+    når bare én stasjons observasjoner er ødelagt.
+    """
+    api_key = api_key or os.environ.get("NVE_API_KEY")
+    result, missing = {}, []
+    for sid in station_ids:
+        cached = _disk_cache_load(_disk_cache_path('nve', sid, parameter, hours_back),
+                                  API_CACHE_TTL_NVE)
+        if cached is not None:
+            result[sid] = cached
+        else:
+            missing.append(sid)
+    if not missing:
+        return result
+    try:
+        by_station = {str(item.get('stationId')): item.get('observations')
+                      for item in _nve_request(missing, parameter, hours_back, api_key)}
+    except requests.exceptions.HTTPError:
+        by_station = {}
+    except Exception as e:
+        print(f"[glommadyppen_core] Datafeil stasjoner {','.join(missing)}: "
+              f"{str(e)[:100]}", file=sys.stderr)
+        by_station = {}
+    # Hver stasjon parses for seg: en ødelagt observasjon (ikke-numerisk
+    # verdi, ugyldig tidsstempel) gir tom ramme for den stasjonen alene, i
+    # stedet for å felle hele batchen - og med den siden eller cron-kjøringen.
+    for sid in missing:
+        try:
+            df = _nve_frame(by_station.get(sid), parameter, hours_back)
+        except Exception as e:
+            print(f"[glommadyppen_core] Datafeil stasjon {sid}: "
+                  f"{str(e)[:100]}", file=sys.stderr)
+            result[sid] = _nve_empty()
+            continue
+        _disk_cache_store(_disk_cache_path('nve', sid, parameter, hours_back), df)
+        result[sid] = df
+    return {sid: result[sid] for sid in station_ids}
 
 
 def fetch_frost_wind(hours_back=168):
     """Henter historiske vindmålinger fra Frost API (Kise, SN12680)."""
+    cache_path = _disk_cache_path('frost', FROST_STATION_KISE, hours_back)
+    cached = _disk_cache_load(cache_path, API_CACHE_TTL_NVE)
+    if cached is not None:
+        return cached
     try:
         end_time   = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours_back)
@@ -615,93 +893,226 @@ def fetch_frost_wind(hours_back=168):
             "referencetime":   f"{start_time.strftime('%Y-%m-%dT%H:%M:%SZ')}/{end_time.strftime('%Y-%m-%dT%H:%M:%SZ')}",
             "timeresolutions": "PT1H",
         }
-        r = requests.get(url, params=params, auth=(FROST_CLIENT_ID, ""), timeout=30)
+        r = _session.get(url, params=params, auth=(FROST_CLIENT_ID, ""), timeout=30)
         if r.status_code != 200:
             return pd.DataFrame()
-        records = []
-        for item in r.json().get('data', []):
-            obs_dict = {'time': pd.to_datetime(item['referenceTime'])}
-            for obs in item.get('observations', []):
-                obs_dict[obs['elementId']] = obs['value']
-            records.append(obs_dict)
-        if not records:
+        items = _parse_json(r).get('data', [])
+        if not items:
             return pd.DataFrame()
-        df = pd.DataFrame(records).sort_values('time').reset_index(drop=True)
-        df = df.rename(columns={'wind_from_direction': 'wind_direction'})
+        # Kolonnevis i forhåndsallokerte arrays, som for Met.no: ingen dict per
+        # tidssteg som pandas må transponere. Manglende element blir NaN; er et
+        # element rapportert flere ganger i samme tidssteg, vinner det siste.
+        n     = len(items)
+        times = [item['referenceTime'] for item in items]
+        cols  = {'wind_speed':          np.full(n, np.nan, dtype=np.float32),
+                 'wind_from_direction': np.full(n, np.nan, dtype=np.float32)}
+        for i, item in enumerate(items):
+            for obs in item.get('observations', ()):
+                arr = cols.get(obs['elementId'])
+                if arr is not None and obs.get('value') is not None:
+                    arr[i] = obs['value']
+        # Tidene parses samlet og normaliseres til UTC ved inntak, som for NVE.
+        df = pd.DataFrame({'time':           pd.to_datetime(times, utc=True, format='ISO8601'),
+                           'wind_speed':     cols['wind_speed'],
+                           'wind_direction': cols['wind_from_direction']})
+        if not df['time'].is_monotonic_increasing:
+            df = df.sort_values('time', kind='stable').reset_index(drop=True)
+        _disk_cache_store(cache_path, df)
         return df
     except Exception:
         return pd.DataFrame()
 
 
+# Siste validatorer (Last-Modified, ev. ETag) og ferdig parset ramme per punkt.
+# Met.no støtter betingede GET-er og svarer 304 uten innhold når varselet ikke
+# er oppdatert; da gjenbrukes rammen i stedet for å laste ned og parse hele
+# svaret på nytt.
+_metno_last = {}
+
+
+def _conditional_headers(response):
+    """Validatorene i et svar som forespørselshoder for neste betingede GET."""
+    out = {}
+    if response.headers.get('Last-Modified'):
+        out['If-Modified-Since'] = response.headers['Last-Modified']
+    if response.headers.get('ETag'):
+        out['If-None-Match'] = response.headers['ETag']
+    return out
+
+
 def fetch_weather_forecast(lat, lon, days_ahead=14):
-    """Henter varsel fra Met.no Locationforecast."""
+    """
+    Henter varsel fra Met.no Locationforecast. Rammen har alltid kolonnen
+    southerly_wind (SE/S-komponenten), lagt på ved inntak.
+    """
+    # 'ses' i nøkkelen: diskcachede rammer fra før southerly_wind ble lagt på
+    # ved inntak, treffes aldri og kan ikke bryte garantien over.
+    cache_path = _disk_cache_path('metno', lat, lon, days_ahead, 'ses')
+    cached = _disk_cache_load(cache_path, API_CACHE_TTL_WEATHER)
+    if cached is not None:
+        return cached
     try:
+        point   = (lat, lon, days_ahead)
+        prev    = _metno_last.get(point)
         url     = "https://api.met.no/weatherapi/locationforecast/2.0/complete"
-        headers = {"User-Agent": "GlommaDyppenApp/1.0 stevne@fetsk.no"}
+        headers = dict(prev[0]) if prev is not None else {}
         params  = {"lat": lat, "lon": lon}
-        response = requests.get(url, params=params, headers=headers, timeout=30)
+        response = _session.get(url, params=params, headers=headers, timeout=30)
+        if response.status_code == 304 and prev is not None:
+            _disk_cache_store(cache_path, prev[1])
+            return prev[1]
         response.raise_for_status()
-        data = response.json()
-
-        forecast_list = []
-        max_time = pd.Timestamp.now(tz='UTC') + pd.Timedelta(days=days_ahead)
-        for ts in data['properties']['timeseries']:
-            t = pd.to_datetime(ts['time'])
-            if t > max_time:
+        data = _parse_json(response)
+
+        # Met.no leverer tidene som 'YYYY-MM-DDTHH:MM:SSZ'. Det formatet
+        # sorterer leksikografisk som tid, så løkken kan sammenligne strenger og
+        # bryte ved horisonten uten å bygge en Timestamp per element. Tidene
+        # parses samlet i ett vektorisert kall til slutt.
+        max_iso = (pd.Timestamp.now(tz='UTC') + pd.Timedelta(days=days_ahead)
+                   ).strftime('%Y-%m-%dT%H:%M:%SZ')
+        series = data['properties']['timeseries']
+
+        # Kolonnevis i forhåndsallokerte arrays - ingen liste med én dict per
+        # tidssteg som pandas må transponere etterpå. Manglende felt blir NaN.
+        n      = len(series)
+        times  = np.empty(n, dtype=object)
+        cols   = {name: np.full(n, np.nan, dtype=np.float32)
+                  for name in ('air_temperature', 'wind_speed', 'wind_direction',
+                               'wind_gust', 'precipitation')}
+        fields = (('air_temperature', 'air_temperature'),
+                  ('wind_speed',      'wind_speed'),
+                  ('wind_direction',  'wind_from_direction'),
+                  ('wind_gust',       'wind_speed_of_gust'))
+        i = 0
+        for ts in series:
+            t = ts['time']
+            if t > max_iso:
                 break
+            times[i] = t
             details = ts['data']['instant']['details']
-            precip = None
+            for col, key in fields:
+                v = details.get(key)
+                if v is not None:
+                    cols[col][i] = v
             for window in ('next_1_hours', 'next_6_hours'):
                 if window in ts['data']:
-                    precip = ts['data'][window].get('details', {}).get('precipitation_amount')
+                    v = ts['data'][window].get('details', {}).get('precipitation_amount')
+                    if v is not None:
+                        cols['precipitation'][i] = v
                     break
-            forecast_list.append({
-                'time':            t,
-                'air_temperature': details.get('air_temperature'),
-                'wind_speed':      details.get('wind_speed'),
-                'wind_direction':  details.get('wind_from_direction'),
-                'wind_gust':       details.get('wind_speed_of_gust'),
-                'precipitation':   precip,
-            })
-        return pd.DataFrame(forecast_list)
+            i += 1
+        if i == 0:
+            return pd.DataFrame()
+        # Eksplisitt format: strptime-stien i stedet for formatgjetting per
+        # element. Samme format som strengsammenligningen over forutsetter.
+        df = pd.DataFrame({'time': pd.to_datetime(times[:i], utc=True,
+                                                  format='%Y-%m-%dT%H:%M:%SZ'),
+                           **{name: arr[:i] for name, arr in cols.items()}})
+        # SE/S-komponenten legges på én gang ved inntak. Den cachede rammen
+        # deles av vindgrafen, døgntabellen, nøkkeltallene og modellen, og
+        # add_southerly_component() blir da et oppslag i stedet for et nytt
+        # gjennomløp hos hver av dem.
+        df['southerly_wind'] = _southerly_wind(cols['wind_direction'][:i],
+                                               cols['wind_speed'][:i])
+        # Sortert rekkefølge garanteres her, ved inntak, som for NVE og Frost,
+        # slik at nedstrøms kode kan nøye seg med is_monotonic_increasing.
+        if not df['time'].is_monotonic_increasing:
+            df = df.sort_values('time', kind='stable').reset_index(drop=True)
+        validators = _conditional_headers(response)
+        if validators:
+            _metno_last[point] = (validators, df)
+        _disk_cache_store(cache_path, df)
+        return df
     except Exception as e:
         print(f"[glommadyppen_core] Feil ved henting av varsel: {e}", file=sys.stderr)
         return pd.DataFrame()
 
 
+def fetch_concurrently(jobs, max_workers=8, initializer=None):
+    """
+    Kjører uavhengige hentinger samtidig og returnerer {navn: resultat}.
+
+    `jobs` er {navn: funksjon uten argumenter}. Alle hentefunksjonene over er
+    ren nettverks-I/O som slipper GIL-en mens de venter på svar, så samlet
+    ventetid blir den tregeste enkelthentingen i stedet for summen av dem.
+    Hentefunksjonene fanger sine egne feil og returnerer tomme DataFrames, så
+    ett utilgjengelig API tar ikke med seg de andre.
+
+    `initializer` kjøres én gang i hver arbeidertråd (appen bruker den til å
+    knytte trådene til Streamlit-konteksten).
+    """
+    if not jobs:
+        return {}
+    workers = max(1, min(max_workers, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers, initializer=initializer) as ex:
+        futures = {name: ex.submit(fn) for name, fn in jobs.items()}
+        return {name: fut.result() for name, fut in futures.items()}
+
+
 # ============================================================================
 # ANALYSIS / MODEL FUNCTIONS
 # ============================================================================
 
+def _southerly_wind(wd, ws):
+    """
+    SE/S-komponenten som float32-array: vindfarten der retningen ligger i
+    sektoren (begge grenser inkludert), ellers 0. Manglende vindfart forblir
+    NaN i sektoren.
+    """
+    is_ses = (wd >= WIND_SECTOR_MIN) & (wd <= WIND_SECTOR_MAX)
+    return np.where(is_ses, ws, np.float32(0.0))
+
+
+def _wind_arrays(df, n=None):
+    """(retning, fart) som float32-arrays, eventuelt bare de første n radene."""
+    wd = pd.to_numeric(df['wind_direction'].iloc[:n], errors='coerce').to_numpy(
+        dtype=np.float32, na_value=np.nan)
+    ws = pd.to_numeric(df['wind_speed'].iloc[:n], errors='coerce').to_numpy(
+        dtype=np.float32, na_value=np.nan)
+    return wd, ws
+
+
 def add_southerly_component(df):
-    """Legger til southerly_wind-kolonne (vind fra SE/S sektor, 135–225°)."""
-    if df.empty or 'wind_direction' not in df.columns:
+    """
+    Returnerer rammen med southerly_wind-kolonne (vind fra SE/S sektor,
+    135–225°). Inndata endres ikke: .assign() gir en ny ramme, så kallere
+    trenger ikke .copy() først - heller ikke på de delte, cachede API-rammene.
+    """
+    # Idempotent: har rammen allerede kolonnen (f.eks. fra et tidligere kall
+    # eller et cachet resultat), returneres den urørt uten nytt gjennomløp.
+    if df.empty or 'wind_direction' not in df.columns or 'southerly_wind' in df.columns:
         return df
-    is_ses = ((df['wind_direction'] >= WIND_SECTOR_MIN) &
-              (df['wind_direction'] <= WIND_SECTOR_MAX))
-    df['southerly_wind'] = np.where(is_ses, df['wind_speed'], 0.0)
-    return df
+    # Rett på numpy-arrayene: ingen mellomliggende bool-Series og ingen
+    # indeksjustert tilordning.
+    return df.assign(southerly_wind=_southerly_wind(*_wind_arrays(df)))
 
 
 def detect_temperature_drop(df, threshold_C=2.0, window_hours=6):
     """Detekterer signifikante temperaturfall i et tidsvindu."""
     if df.empty or len(df) < 2:
         return None
-    df = df.sort_values('time').copy()
-    cutoff = df['time'].max() - pd.Timedelta(hours=window_hours)
-    recent = df[df['time'] >= cutoff]
-    if len(recent) < 2:
+    # fetch_nve_data leverer allerede sortert; sorter bare hvis noe annet kom inn.
+    if not df['time'].is_monotonic_increasing:
+        df = df.sort_values('time')
+    # Ett gjennomløp på numpy: binærsøk etter vinduets start, deretter
+    # argmax/argmin på utsnittet. Ingen indeksert Series og ingen kopier.
+    t = df['time'].values.astype('datetime64[ns]')
+    v = df['value'].to_numpy(dtype=np.float64, na_value=np.nan)
+    start = int(np.searchsorted(t, t[-1] - np.timedelta64(int(window_hours * 3600), 's'),
+                                side='left'))
+    v_win = v[start:]
+    if len(v_win) < 2 or not np.isfinite(v_win).any():
         return None
-    max_t, min_t = recent['value'].max(), recent['value'].min()
-    drop = max_t - min_t
-    if drop < threshold_C:
+    imax, imin = int(np.nanargmax(v_win)), int(np.nanargmin(v_win))
+    drop = v_win[imax] - v_win[imin]
+    if not drop >= threshold_C:
         return None
     return {
-        'magnitude': drop,
-        'max_temp':  max_t,
-        'min_temp':  min_t,
-        'max_time':  recent[recent['value'] == max_t]['time'].iloc[0],
-        'min_time':  recent[recent['value'] == min_t]['time'].iloc[0],
+        'magnitude': float(drop),
+        'max_temp':  float(v_win[imax]),
+        'min_temp':  float(v_win[imin]),
+        'max_time':  df['time'].iloc[start + imax],
+        'min_time':  df['time'].iloc[start + imin],
     }
 
 
@@ -716,10 +1127,9 @@ def safe_discharge(discharge_df, fallback, hours=24):
     """
     if discharge_df is not None and not discharge_df.empty:
         try:
-            d = discharge_df.copy()
-            d['time'] = pd.to_datetime(d['time'])
-            cutoff = d['time'].max() - pd.Timedelta(hours=hours)
-            recent = d[d['time'] >= cutoff]['value'].dropna()
+            t = _utc_times(discharge_df['time'])
+            recent = discharge_df.loc[t >= t.max() - pd.Timedelta(hours=hours),
+                                      'value'].dropna()
             if len(recent) > 0:
                 q = float(recent.median())
                 if DISCHARGE_MIN_VALID <= q <= DISCHARGE_MAX_VALID:
@@ -958,6 +1368,61 @@ def swim_assist(q_m3s, pace_s_per_100m, k_from=None, k_to=None, length_km=None):
     }
 
 
+def _utc_times(times):
+    """
+    Tidskolonne som tz-aware. Serier fra fetch_*-funksjonene er det allerede og
+    returneres urørt (ingen kopi, ingen gjennomløp); bare naive serier fra
+    andre kilder parses og tolkes som UTC.
+    """
+    if isinstance(times.dtype, pd.DatetimeTZDtype):
+        if str(times.dtype.tz) == 'UTC':
+            return times
+        return times.dt.tz_convert('UTC')
+    return pd.to_datetime(times, utc=True)
+
+
+def _now_utc(now=None):
+    """
+    «Nå» som tz-aware UTC Timestamp[ns]. Kallere som allerede har et felles
+    nå-tidspunkt (én Streamlit-rerun, én loggkjøring) sender det inn, slik at
+    alle beregningene i kjøringen regner mot samme øyeblikk; naive verdier
+    tolkes som UTC.
+    """
+    now_utc = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+    if now_utc.tz is None:
+        now_utc = now_utc.tz_localize('UTC')
+    return now_utc.tz_convert('UTC').as_unit('ns')
+
+
+def _to_datetime64(t):
+    """Tidspunkt → naiv UTC numpy.datetime64[ns], samme akse som Series.values."""
+    t = pd.Timestamp(t)
+    if t.tzinfo is not None:
+        t = t.tz_convert('UTC').tz_localize(None)
+    return t.to_datetime64().astype('datetime64[ns]')
+
+
+def nearest_time_index(times, target):
+    """
+    Posisjonen i den sorterte tidsaksen `times` som ligger nærmest `target`.
+
+    `times` kan være en tidskolonne (tz-aware eller naiv UTC) eller en
+    datetime64-array. Binærsøk i stedet for |t − target|.idxmin(): samme rad
+    (ved likt avstand det tidligste punktet, slik idxmin() gjør), uten en
+    midlertidig differansekolonne.
+    """
+    if isinstance(times, (pd.Series, pd.Index)):
+        times = times.values
+    times = np.asarray(times).astype('datetime64[ns]')
+    t = _to_datetime64(target)
+    pos = int(np.searchsorted(times, t, side='left'))
+    if pos <= 0:
+        return 0
+    if pos >= len(times):
+        return len(times) - 1
+    return pos - 1 if (t - times[pos - 1]) <= (times[pos] - t) else pos
+
+
 def _hourly_series(df, value_col='value'):
     """
     Konverterer en NVE-serie til en tz-aware Series på fast timesgrid med
@@ -966,16 +1431,13 @@ def _hourly_series(df, value_col='value'):
     """
     if df is None or df.empty:
         return None
-    d = df.copy()
-    d['time'] = pd.to_datetime(d['time'])
-    if d['time'].dt.tz is None:
-        d['time'] = d['time'].dt.tz_localize('UTC')
-    else:
-        d['time'] = d['time'].dt.tz_convert('UTC')
+    d = df.assign(time=_utc_times(df['time']))
     d = (d.dropna(subset=[value_col])
-           .drop_duplicates(subset='time', keep='last')
-           .sort_values('time')
-           .set_index('time')[value_col])
+           .drop_duplicates(subset='time', keep='last'))
+    # fetch_nve_data leverer allerede sortert; sorter bare hvis noe annet kom inn.
+    if not d['time'].is_monotonic_increasing:
+        d = d.sort_values('time')
+    d = d.set_index('time')[value_col]
     if d.empty:
         return None
     # Tving nanosekund-oppløsning. NVE/pandas kan gi 's'- eller 'us'-oppløsning,
@@ -990,7 +1452,7 @@ def _hourly_series(df, value_col='value'):
         method='time', limit=6).reindex(grid)
 
 
-def detect_seiche_risk(vorma_df, hours_back_history=None):
+def detect_seiche_risk(vorma_df, hours_back_history=None, now=None):
     """
     Sjekker om det finnes en bekreftet kald oppvellingsepisode (ΔT ≥ 3 °C,
     bunn < 10 °C) ved Minnesund i perioden 5–12 dager tilbake i tid.
@@ -1012,6 +1474,8 @@ def detect_seiche_risk(vorma_df, hours_back_history=None):
         'episode_dT'     : float – ΔT (baseline − bunn)
         'days_ago'       : float – dager siden primær bunn
         'days_remaining' : float – dager til slutt på seiche-vindu (dag 12)
+
+    `now` (valgfri) er referansetidspunktet, som i build_fetsund_forecast.
     """
     result = {
         'active': False,
@@ -1028,17 +1492,16 @@ def detect_seiche_risk(vorma_df, hours_back_history=None):
 
     hours_back_history = hours_back_history or SEICHE_HISTORY_HOURS
 
-    df = vorma_df.copy()
-    df['time'] = pd.to_datetime(df['time'])
-    if df['time'].dt.tz is None:
-        df['time'] = df['time'].dt.tz_localize('UTC')
-    df = df.sort_values('time').reset_index(drop=True)
+    df = vorma_df.assign(time=_utc_times(vorma_df['time']))
+    if not df['time'].is_monotonic_increasing:
+        df = df.sort_values('time')
+    df = df.reset_index(drop=True)
 
-    now_utc = pd.Timestamp.now(tz='UTC')
+    now_utc = _now_utc(now)
 
     # Hent siste `hours_back_history` timer for å ha nok historikk til baseline
     cutoff = now_utc - timedelta(hours=hours_back_history)
-    df = df[df['time'] >= cutoff].copy()
+    df = df[df['time'] >= cutoff]
     if len(df) < 24:
         return result
 
@@ -1100,6 +1563,30 @@ def detect_seiche_risk(vorma_df, hours_back_history=None):
     return result
 
 
+def _predict_core(times_ns, values, target_ns, baseline_hours):
+    """
+    Den numeriske kjernen i predict_fetsund_temperature(), på rå arrays.
+
+    times_ns: sortert int64-array (ns siden epoch, UTC), values: float64.
+    Returnerer (i, vorma_temp, vorma_baseline): posisjonen nærmest target_ns
+    (binærsøk, likt avstand → tidligste, slik idxmin() gjør), verdien der og
+    medianen over `baseline_hours` timer bakover fra det punktet.
+    """
+    n = len(times_ns)
+    pos = int(np.searchsorted(times_ns, target_ns, side='left'))
+    if pos <= 0:
+        i = 0
+    elif pos >= n:
+        i = n - 1
+    else:
+        i = pos - 1 if target_ns - times_ns[pos - 1] <= times_ns[pos] - target_ns else pos
+    i0 = int(np.searchsorted(times_ns, times_ns[i] - baseline_hours * 3_600_000_000_000,
+                             side='left'))
+    window = values[i0:]
+    baseline = float(np.nanmedian(window)) if np.isfinite(window).any() else np.nan
+    return i, float(values[i]), baseline
+
+
 def predict_fetsund_temperature(vorma_temp_df, discharge_df, event_datetime,
                                 fetsund_temp_df=None, glomma_q_df=None):
     """
@@ -1125,32 +1612,27 @@ def predict_fetsund_temperature(vorma_temp_df, discharge_df, event_datetime,
     kappa, f_mix, kappa_src = dilution_kappa(discharge_df, glomma_q_df, mode='episode')
     prediction_time = event_datetime - timedelta(hours=travel_hours)
 
-    df = vorma_temp_df.copy()
-    df['time'] = pd.to_datetime(df['time'])
-    if df['time'].dt.tz is None:
-        df['time'] = df['time'].dt.tz_localize('UTC')
-
-    df['time_diff'] = abs(df['time'] - prediction_time)
-    closest_idx = df['time_diff'].idxmin()
-    if pd.isna(closest_idx):
+    df = vorma_temp_df
+    if not isinstance(df['time'].dtype, pd.DatetimeTZDtype):
+        df = df.assign(time=_utc_times(df['time']))
+    df = df.dropna(subset=['time'])
+    if df.empty:
         return None
-
-    vorma_temp = df.loc[closest_idx, 'value']
-    vorma_time = df.loc[closest_idx, 'time']
-
-    vorma_baseline = df[
-        df['time'] >= (vorma_time - timedelta(hours=VORMA_BASELINE_HOURS))
-    ]['value'].median()
+    if not df['time'].is_monotonic_increasing:
+        df = df.sort_values('time')
+
+    times_ns = df['time'].values.astype('datetime64[ns]').view(np.int64)
+    values   = df['value'].to_numpy(dtype=np.float64, na_value=np.nan)
+    target_ns = int(_to_datetime64(prediction_time).view(np.int64))
+    i, vorma_temp, vorma_baseline = _predict_core(times_ns, values, target_ns,
+                                                  VORMA_BASELINE_HOURS)
+    vorma_time = df['time'].iloc[i]
     anomaly = vorma_temp - vorma_baseline
 
     if fetsund_temp_df is not None and not fetsund_temp_df.empty:
-        fe = fetsund_temp_df.copy()
-        fe['time'] = pd.to_datetime(fe['time'])
-        if fe['time'].dt.tz is None:
-            fe['time'] = fe['time'].dt.tz_localize('UTC')
-        latest_fe = fe['time'].max()
-        recent_fe = fe[fe['time'] >= latest_fe - timedelta(hours=48)]
-        fetsund_baseline = recent_fe['value'].median()
+        fe_t = _utc_times(fetsund_temp_df['time'])
+        fetsund_baseline = fetsund_temp_df.loc[
+            fe_t >= fe_t.max() - timedelta(hours=48), 'value'].median()
         baseline_source  = "Fetsund 48t-median"
     else:
         fetsund_baseline = vorma_baseline + 1.5
@@ -1177,22 +1659,55 @@ def predict_fetsund_temperature(vorma_temp_df, discharge_df, event_datetime,
     }
 
 
+# Tidskonfidens som trappefunksjon av dataalderen (timer): < 1 t → 1.0,
+# < 6 t → 0.9, < 24 t → 0.7, ellers 0.5. Oppslag med searchsorted virker
+# likt for én alder og for en hel array av aldre; NaN havner i siste trinn.
+_CONFIDENCE_AGE_H  = np.array([1.0, 6.0, 24.0])
+_CONFIDENCE_LEVELS = np.array([1.0, 0.9, 0.7, 0.5])
+
+
 def _calculate_confidence(df, target_time):
-    latest = pd.to_datetime(df['time'].max())
-    if latest.tz is None:
-        latest = latest.tz_localize('UTC')
+    latest = _utc_times(df['time']).max()
+    target_time = pd.Timestamp(target_time)
     if target_time.tz is None:
         target_time = target_time.tz_localize('UTC')
     hours_old = (target_time - latest).total_seconds() / 3600
-    if hours_old < 1:    tc = 1.0
-    elif hours_old < 6:  tc = 0.9
-    elif hours_old < 24: tc = 0.7
-    else:                tc = 0.5
-    return tc * min(len(df) / 72, 1.0)
+    tc = _CONFIDENCE_LEVELS[np.searchsorted(_CONFIDENCE_AGE_H, hours_old, side='right')]
+    return float(tc) * min(len(df) / 72, 1.0)
+
+
+def southerly_wind_stats(weather_forecast, n_steps=48):
+    """
+    Vindnøkkeltall for de første `n_steps` varselstegene, regnet én gang.
+
+    Returnerer {'avg_wind', 'max_wind', 'avg_southerly'} (m/s, NaN hvis
+    varselet mangler). Appen og assess_risk_open_water() bruker samme dict i
+    stedet for å kutte ut head(48) og ta mean() hver for seg.
+    """
+    stats = {'avg_wind': np.nan, 'max_wind': np.nan, 'avg_southerly': np.nan}
+    if weather_forecast is None or weather_forecast.empty \
+            or 'wind_speed' not in weather_forecast.columns:
+        return stats
+    ws = weather_forecast['wind_speed'].to_numpy(dtype=np.float64, na_value=np.nan)[:n_steps]
+    if 'southerly_wind' in weather_forecast.columns:
+        sw = weather_forecast['southerly_wind'].to_numpy(
+            dtype=np.float64, na_value=np.nan)[:n_steps]
+    elif 'wind_direction' in weather_forecast.columns:
+        # Uten ferdig kolonne regnes komponenten bare for de n_steps radene
+        # som trengs - ingen kopi av hele varselet.
+        sw = _southerly_wind(*_wind_arrays(weather_forecast, n_steps)).astype(np.float64)
+    else:
+        sw = np.empty(0)
+    if np.isfinite(ws).any():
+        stats['avg_wind'] = float(np.nanmean(ws))
+        stats['max_wind'] = float(np.nanmax(ws))
+    if np.isfinite(sw).any():
+        stats['avg_southerly'] = float(np.nanmean(sw))
+    return stats
 
 
 def assess_risk_open_water(predicted_temp, weather_forecast=None,
-                           seiche_risk=None):
+                           seiche_risk=None, wind_stats=None):
     """
     Risikovurdering basert på World Athletics / FINA OW-regler og
     Glommadyppens lokale regler.
@@ -1204,17 +1719,17 @@ def assess_risk_open_water(predicted_temp, weather_forecast=None,
 
     seiche_risk: dict fra detect_seiche_risk() – legger til advarsel om
     sekundær kaldpuls dersom aktiv.
+
+    wind_stats: dict fra southerly_wind_stats(). Er den gitt, brukes den
+    direkte og weather_forecast trengs ikke.
     """
     WETSUIT_ALWAYS = "🧥 Obligatorisk (Glommadyppen-regel)"
     WETSUIT_COLOR  = "#2c6e9e"
 
-    southerly_risk = False
-    if weather_forecast is not None and not weather_forecast.empty:
-        df_wf = weather_forecast.copy()
-        if 'southerly_wind' not in df_wf.columns:
-            df_wf = add_southerly_component(df_wf)
-        avg_s = df_wf.head(48)['southerly_wind'].mean()
-        southerly_risk = avg_s >= CRITICAL_WIND_SPEED
+    if wind_stats is None:
+        wind_stats = southerly_wind_stats(weather_forecast)
+    avg_s = wind_stats.get('avg_southerly')
+    southerly_risk = avg_s is not None and avg_s >= CRITICAL_WIND_SPEED
 
     if predicted_temp < OW_ABORT:
         label, color = "Svømming bør ikke gjennomføres", "#6B0000"
@@ -1307,9 +1822,14 @@ def read_prediction_log(sheet_id=None, worksheet_name=None):
         df = pd.read_csv(url)
         if df.empty:
             return df
+        # Én parse per kolonne med format='ISO8601' og utc=True. isoformat()
+        # tar bare med mikrosekunder når de er ≠ 0, og event_date har lokal
+        # Oslo-offset; formatgjetting ut fra første rad ga da NaT for rader
+        # med annen form. Senere to_datetime(..., utc=True) blir no-op.
         for col in ('logged_at', 'event_date'):
             if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
+                df[col] = pd.to_datetime(df[col], errors='coerce', utc=True,
+                                         format='ISO8601')
         return df
     except Exception as e:
         print(f"[glommadyppen_core] Kunne ikke lese prediksjonslogg: {e}", file=sys.stderr)
@@ -1382,55 +1902,86 @@ def evaluate_prediction_log(log_df, fetsund_df, horizons=None,
     if log.empty:
         return pd.DataFrame(columns=cols)
 
+    # Én vektorisert runde per horisont over hele loggen: gyldighetstidene,
+    # nærmeste observasjon (ett get_indexer-kall) og toleransetesten regnes på
+    # arrays. Tidligere ble hver (loggrad × horisont) slått opp for seg med
+    # iterrows og bygget som en dict.
     obs_times = obs.index
-    rows = []
-    for _, r in log.iterrows():
-        t0 = r['logged_at']
-        for h in horizons:
-            pred = _to_num(r.get(f'predicted_h{h}'))
-            if not np.isfinite(pred):
-                continue
-            valid = (t0 + pd.Timedelta(hours=h)).as_unit('ns')
-            if valid > obs_times.max() or valid < obs_times.min():
-                continue
-            pos = obs_times.get_indexer([valid], method='nearest')[0]
-            if pos < 0:
-                continue
-            t_obs = obs_times[pos]
-            if abs((t_obs - valid).total_seconds()) > tolerance_h * 3600:
-                continue
-            observed = float(obs.iloc[pos])
-            if not np.isfinite(observed):
-                continue
+    obs_v     = obs.to_numpy(dtype=float)
+    t_min, t_max = obs_times.min(), obs_times.max()
+    logged    = log['logged_at'].reset_index(drop=True)
+    n         = len(logged)
+
+    def _num(col):
+        if col not in log.columns:
+            return np.full(n, np.nan)
+        return log[col].map(_to_num).to_numpy(dtype=float)
+
+    parts = []
+    for k, h in enumerate(horizons):
+        pred  = _num(f'predicted_h{h}')
+        valid = (logged + pd.Timedelta(hours=h)).dt.as_unit('ns')
+        keep  = np.isfinite(pred) & (valid >= t_min).to_numpy() & (valid <= t_max).to_numpy()
+        pos   = obs_times.get_indexer(pd.DatetimeIndex(valid), method='nearest')
+        keep &= pos >= 0
+        pos_c = np.where(pos >= 0, pos, 0)
+        gap_s = np.abs((obs_times[pos_c] - pd.DatetimeIndex(valid)).total_seconds())
+        observed = obs_v[pos_c]
+        keep &= (np.asarray(gap_s) <= tolerance_h * 3600) & np.isfinite(observed)
+        if not keep.any():
+            continue
+
+        lo68, hi68 = _num(f'lower68_h{h}')[keep], _num(f'upper68_h{h}')[keep]
+        sigma      = _num(f'sigma_h{h}')[keep]
+        ok95 = np.isfinite(sigma)
+        lo95 = np.where(ok95 & np.isfinite(lo68), lo68 - 0.96 * sigma, np.nan)
+        hi95 = np.where(ok95 & np.isfinite(hi68), hi68 + 0.96 * sigma, np.nan)
+        o, p = observed[keep], pred[keep]
+        wr_col = f'windrisk_h{h}'
+        parts.append(pd.DataFrame({
+            '_row':        np.flatnonzero(keep),
+            '_k':          k,
+            'logged_at':   logged[keep].reset_index(drop=True),
+            'horizon_h':   int(h),
+            'valid_time':  valid[keep].reset_index(drop=True),
+            'predicted':   p,
+            'lower68':     lo68,
+            'upper68':     hi68,
+            'lower95':     lo95,
+            'upper95':     hi95,
+            'sigma':       sigma,
+            'delta_vorma': _num(f'delta_vorma_h{h}')[keep],
+            'windrisk':    (log[wr_col].to_numpy(dtype=object)[keep]
+                            if wr_col in log.columns else None),
+            'observed':    o,
+            'error':       p - o,
+            'abs_error':   np.abs(p - o),
+            'in68': _interval_hit(lo68, hi68, o),
+            'in95': _interval_hit(lo95, hi95, o),
+        }))
+
+    if parts:
+        # Samme radrekkefølge som før: loggrad for loggrad, horisontene i orden.
+        out = (pd.concat(parts, ignore_index=True)
+                 .sort_values(['_row', '_k'], kind='stable'))
+        out = out[cols].reset_index(drop=True)
+        # Uten manglende intervaller blir in68/in95 rene bool-kolonner, som før.
+        out[['in68', 'in95']] = out[['in68', 'in95']].infer_objects()
+    else:
+        out = pd.DataFrame(columns=cols)
+    # Ordnet kategori: int8-koder i stedet for én streng per rad, og groupby i
+    # appen gir nivåene i rekkefølgen lav → advarsel → alarm, ikke alfabetisk.
+    out['windrisk'] = pd.Categorical(out['windrisk'], categories=_RISK_LEVELS,
+                                     ordered=True)
+    return out
 
-            lo68  = _to_num(r.get(f'lower68_h{h}'))
-            hi68  = _to_num(r.get(f'upper68_h{h}'))
-            sigma = _to_num(r.get(f'sigma_h{h}'))
-            lo95  = lo68 - 0.96 * sigma if np.isfinite(sigma) and np.isfinite(lo68) else float('nan')
-            hi95  = hi68 + 0.96 * sigma if np.isfinite(sigma) and np.isfinite(hi68) else float('nan')
-
-            rows.append({
-                'logged_at':   t0,
-                'horizon_h':   int(h),
-                'valid_time':  valid,
-                'predicted':   pred,
-                'lower68':     lo68,
-                'upper68':     hi68,
-                'lower95':     lo95,
-                'upper95':     hi95,
-                'sigma':       sigma,
-                'delta_vorma': _to_num(r.get(f'delta_vorma_h{h}')),
-                'windrisk':    r.get(f'windrisk_h{h}'),
-                'observed':    observed,
-                'error':       pred - observed,
-                'abs_error':   abs(pred - observed),
-                'in68': (bool(lo68 <= observed <= hi68)
-                         if np.isfinite(lo68) and np.isfinite(hi68) else None),
-                'in95': (bool(lo95 <= observed <= hi95)
-                         if np.isfinite(lo95) and np.isfinite(hi95) else None),
-            })
-
-    return pd.DataFrame(rows, columns=cols)
+
+def _interval_hit(lo, hi, observed):
+    """lo ≤ observed ≤ hi per element som object-array: True/False, None der
+    intervallet mangler (samme form som in68/in95 alltid har hatt)."""
+    fin = np.isfinite(lo) & np.isfinite(hi)
+    hit = (lo <= observed) & (observed <= hi)
+    return np.array([bool(x) if f else None for x, f in zip(hit, fin)], dtype=object)
 
 
 def summarize_prediction_skill(eval_df):
@@ -1495,14 +2046,23 @@ def prediction_history_series(log_df, horizon_h=24):
     d['predicted'] = d[col].map(_to_num)
     d['lower68']   = d.get(f'lower68_h{horizon_h}', pd.Series(index=d.index)).map(_to_num)
     d['upper68']   = d.get(f'upper68_h{horizon_h}', pd.Series(index=d.index)).map(_to_num)
-    d = (d.dropna(subset=['time', 'predicted'])
-           .sort_values('time')
-           .drop_duplicates(subset='time', keep='last'))
+    d = d.dropna(subset=['time', 'predicted'])
+    # Loggen skrives kronologisk, så sorteringen trengs nesten aldri. Den er
+    # stabil, slik at keep='last' gir den sist loggede raden ved like tider.
+    if not d['time'].is_monotonic_increasing:
+        d = d.sort_values('time', kind='stable')
+    d = d.drop_duplicates(subset='time', keep='last')
     return d[cols].reset_index(drop=True)
 
 
+@lru_cache(maxsize=8)
 def calculate_event_date(year):
-    """Beregner dato for første lørdag i august."""
+    """
+    Beregner dato for første lørdag i august.
+
+    Ren funksjon av året (og modulkonstantene), og pd.Timestamp er uforanderlig,
+    så resultatet memoiseres - appen kaller den ved hver rerun.
+    """
     first_day   = datetime(year, EVENT_MONTH, 1)
     days_to_sat = (EVENT_DAY_OF_WEEK - first_day.weekday()) % 7
     if days_to_sat == 0 and first_day.weekday() != EVENT_DAY_OF_WEEK:
@@ -1512,46 +2072,71 @@ def calculate_event_date(year):
     return pd.Timestamp(event_date).tz_localize('Europe/Oslo').tz_convert('UTC')
 
 
+_WIND_ROSE = np.array(['N', 'NØ', 'Ø', 'SØ', 'S', 'SV', 'V', 'NV'])
+
+
 def wind_rose_label(degrees):
-    dirs = ['N', 'NØ', 'Ø', 'SØ', 'S', 'SV', 'V', 'NV']
-    return dirs[round(degrees / 45) % 8]
+    """
+    Åttedelt kompassretning for en vindretning i grader. Tar også en array og
+    gir da en array med etiketter i ett vektorisert oppslag (np.rint runder
+    halve mot partall, som round()). Manglende retning (NaN) gir '–'.
+    """
+    deg = np.asarray(degrees, dtype=np.float64)
+    # NaN maskeres før heltallskonverteringen: astype(int64) gir ellers
+    # INT64_MIN (med RuntimeWarning), og % 8 gjør det stille om til 'N'.
+    ok = np.isfinite(deg)
+    idx = np.rint(np.where(ok, deg, 0.0) / 45).astype(np.int64) % 8
+    labels = np.where(ok, _WIND_ROSE[idx], '–')
+    return str(labels) if labels.ndim == 0 else labels
 
 
 def build_wind_energy_series(frost_df, forecast_df,
-                             window_hours=None, lead_hours=None):
+                             window_hours=None, lead_hours=None, now=None):
     """
     Beregner rullende kumulativ SE/S-vindenergi (E) som driver oppvelling.
     Standardverdier: window=48t, lead=24t – optimalt kalibrert mot 3500+ obs.
+    `now` (se _now_utc) er tidspunktet prognosens usikkerhetskjegle måles fra.
     """
     window_hours = window_hours or WIND_WINDOW_HOURS
     lead_hours   = lead_hours   or WIND_LEAD_HOURS
 
-    combined_parts = []
+    # Inndataene kopieres ikke: concat lager uansett en ny ramme, og
+    # is_forecast-flagget settes på resultatet i stedet for på hver del.
+    combined_parts, flags = [], []
     if frost_df is not None and not frost_df.empty:
-        obs = frost_df.copy()
-        obs['is_forecast'] = False
-        combined_parts.append(obs)
+        combined_parts.append(frost_df)
+        flags.append(np.zeros(len(frost_df), dtype=bool))
     if forecast_df is not None and not forecast_df.empty:
-        fc = forecast_df.copy()
-        fc['is_forecast'] = True
-        combined_parts.append(fc)
+        combined_parts.append(forecast_df)
+        flags.append(np.ones(len(forecast_df), dtype=bool))
     if not combined_parts:
         return pd.DataFrame()
 
     df = pd.concat(combined_parts, ignore_index=True)
-    df['time'] = pd.to_datetime(df['time'])
-    if df['time'].dt.tz is None:
-        df['time'] = df['time'].dt.tz_localize('UTC')
-    df = df.sort_values('time').reset_index(drop=True)
-
-    if 'southerly_wind' not in df.columns:
-        df = add_southerly_component(df)
-
-    df['dt'] = df['time'].diff().dt.total_seconds().div(3600).fillna(1.0).clip(lower=0.5, upper=7.0)
-    df['is_ses']    = ((df['wind_direction'] >= WIND_SECTOR_MIN) &
-                       (df['wind_direction'] <= WIND_SECTOR_MAX))
-    df['v_ses']     = np.where(df['is_ses'], df['wind_speed'], 0.0)
-    df['e_contrib'] = df['v_ses'] * df['dt']
+    df['is_forecast'] = np.concatenate(flags)
+    df['time'] = _utc_times(df['time'])
+    # Obs kommer foran prognosen og begge er sortert, så den sammenslåtte
+    # rammen er som regel allerede i tidsrekkefølge. Må den sorteres, er
+    # sorteringen stabil - dedupliseringen under forutsetter det.
+    if not df['time'].is_monotonic_increasing:
+        df = df.sort_values('time', kind='stable').reset_index(drop=True)
+
+    # Sektormasken, SE/S-farten og tidssteget regnes rett på numpy-arrayene i
+    # ett gjennomløp. v_ses ER southerly_wind-komponenten, så den regnes ikke
+    # også via add_southerly_component (kolonnen ble uansett kastet).
+    wd = pd.to_numeric(df['wind_direction'], errors='coerce').to_numpy(
+        dtype=np.float64, na_value=np.nan)
+    ws = pd.to_numeric(df['wind_speed'], errors='coerce').to_numpy(
+        dtype=np.float64, na_value=np.nan)
+    t_ns = df['time'].values.astype('datetime64[ns]').view(np.int64)
+    dt = np.empty(len(df))
+    dt[0] = 1.0
+    dt[1:] = np.diff(t_ns) / 3.6e12
+    dt = np.clip(dt, 0.5, 7.0)
+    v_ses = _southerly_wind(wd, ws)
+    df['dt']        = dt
+    df['v_ses']     = v_ses
+    df['e_contrib'] = v_ses * dt
 
     # Dedupliser tidsstempler (kan oppstå i overlapp mellom Frost-obs og Met.no-prognose).
     # Behold siste rad per tidsstempel; obs ble lagt inn først og sort er stabil,
@@ -1576,7 +2161,7 @@ def build_wind_energy_series(frost_df, forecast_df,
                  'v_ses', 'e_contrib', 'dt', 'E']].reset_index()
     df['E'] = df['E'].fillna(0.0)
 
-    now_utc  = pd.Timestamp.now(tz='UTC')
+    now_utc  = _now_utc(now)
     max_fc_h = 120.0
     df['E_upper'] = df['E']
     df['E_lower'] = df['E']
@@ -1591,12 +2176,12 @@ def build_wind_energy_series(frost_df, forecast_df,
     return df
 
 
-def _effective_wind_energy(energy_lookup, now_utc, h_step):
+def _effective_wind_energy(energy_df, now_utc, h_steps):
     """
-    «Virksom» vindenergi ved prognosetidspunktet now + h_step.
+    «Virksom» vindenergi ved prognosetidspunktene now + h for alle h i h_steps.
 
-    Returnerer det høyeste E som har rukket å virke fram til dette tidspunktet,
-    dempet med relaxation_factor() etter at toppen passerte:
+    For hvert tidspunkt er det det høyeste E som har rukket å virke fram til
+    da, dempet med relaxation_factor() etter at toppen passerte:
 
         E_eff(h) = max over alle t ≤ h av  E(t) · relaksasjon(h − t)
 
@@ -1607,20 +2192,28 @@ def _effective_wind_energy(energy_lookup, now_utc, h_step):
     relaksasjonsmodellen. Punktvis oppslag lot risikoen slå av igjen så snart
     vindtoppen var passert.
 
-    Returnerer None hvis serien ikke dekker tidspunktet.
+    Alle stegene regnes i ett (steg × tidspunkt)-matriseuttrykk på numpy, i
+    stedet for ett DataFrame-filter og en Series-kjede per steg. Returnerer en
+    float-array med én verdi per steg, NaN der serien ikke dekker tidspunktet.
     """
-    if energy_lookup is None or energy_lookup.empty:
-        return None
-    t_fut = now_utc + timedelta(hours=int(h_step))
-    past = energy_lookup[energy_lookup['time'] <= t_fut + pd.Timedelta(minutes=90)]
-    if past.empty:
-        return None
-    age_h = (t_fut - past['time']).dt.total_seconds() / 3600.0
-    age_h = age_h.clip(lower=0.0)
-    eff = past['E'].astype(float).values * relaxation_factor(age_h.values)
-    if len(eff) == 0 or not np.isfinite(eff).any():
-        return None
-    return float(np.nanmax(eff))
+    h = np.asarray(h_steps, dtype=np.int64)
+    out = np.full(len(h), np.nan)
+    if energy_df is None or energy_df.empty:
+        return out
+    d = energy_df[['time', 'E']].dropna(subset=['time'])
+    if d.empty:
+        return out
+    t_ns = _utc_times(d['time']).values.astype('datetime64[ns]').view(np.int64)
+    e    = pd.to_numeric(d['E'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+    fut_ns = now_utc.value + h * 3_600_000_000_000
+    # Punkter inntil 90 min etter tidspunktet teller med (tidsstegene er ikke
+    # alltid på hel time); alderen klippes da til 0.
+    reached = t_ns[None, :] <= fut_ns[:, None] + 90 * 60 * 1_000_000_000
+    age_h = np.clip((fut_ns[:, None] - t_ns[None, :]) / 3.6e12, 0.0, None)
+    eff = np.where(reached, e[None, :] * relaxation_factor(age_h), np.nan)
+    # fmax ignorerer NaN, og en rad uten et eneste endelig bidrag blir NaN.
+    return np.fmax.reduce(eff, axis=1)
 
 
 def build_fetsund_forecast(vorma_df, fetsund_df, discharge_df,
@@ -1677,10 +2270,7 @@ def build_fetsund_forecast(vorma_df, fetsund_df, discharge_df,
     if sv is None or sv.empty:
         return pd.DataFrame()
 
-    now_utc = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
-    if now_utc.tz is None:
-        now_utc = now_utc.tz_localize('UTC')
-    now_utc = now_utc.tz_convert('UTC').as_unit('ns')
+    now_utc = _now_utc(now)
     _, travel_h, _, _ = calculate_travel_time(discharge_df)
     travel_h = max(1.0, float(travel_h))
 
@@ -1819,17 +2409,12 @@ def build_fetsund_forecast(vorma_df, fetsund_df, discharge_df,
     # Referansepunkt for inkrementformen
     sv_ref, _ = _vorma_at(now_utc - pd.Timedelta(hours=travel_h))
 
-    # ── Vindenergi-prognose for oppslag ─────────────────────────────────────
-    energy_lookup = None
-    if energy_df is not None and not energy_df.empty:
-        energy_lookup = energy_df[['time', 'E', 'is_forecast']].dropna(subset=['time']).copy()
-        energy_lookup['time'] = pd.to_datetime(energy_lookup['time'])
-        if energy_lookup['time'].dt.tz is None:
-            energy_lookup['time'] = energy_lookup['time'].dt.tz_localize('UTC')
-        energy_lookup = energy_lookup.sort_values('time').reset_index(drop=True)
+    # ── Virksom vindenergi for alle prognosesteg på én gang ─────────────────
+    steps = range(0, int(hours_ahead) + 1, int(step_h))
+    e_eff = _effective_wind_energy(energy_df, now_utc, steps)
 
     rows = []
-    for h_step in range(0, int(hours_ahead) + 1, int(step_h)):
+    for k, h_step in enumerate(steps):
         t_fut  = now_utc + timedelta(hours=h_step)
         t_src  = t_fut - timedelta(hours=travel_h)
 
@@ -1894,8 +2479,8 @@ def build_fetsund_forecast(vorma_df, fetsund_df, discharge_df,
         # holde båndet åpent nedover, i stedet for å slå av og på.
         e_fc, risk_level = None, None
         sigma_mult, risk_shift = 1.0, 0.0
-        if energy_lookup is not None:
-            e_fc = _effective_wind_energy(energy_lookup, now_utc, h_step)
+        if np.isfinite(e_eff[k]):
+            e_fc = float(e_eff[k])
         if e_fc is not None:
             # Jevn utfasing i stedet for en klippekant ved horisonten
             if h_step <= WIND_RISK_HORIZON_HOURS:
@@ -1904,17 +2489,11 @@ def build_fetsund_forecast(vorma_df, fetsund_df, discharge_df,
                 horizon_w = float(np.exp(
                     -(h_step - WIND_RISK_HORIZON_HOURS) / WIND_RISK_FADE_HOURS))
 
-            # Kontinuerlig multiplikator - ingen trinn ved tersklene
-            if e_fc <= ENERGY_WARN:
-                mult = 1.0 + (WIND_SIGMA_MULT_WARN - 1.0) * max(0.0, e_fc / ENERGY_WARN)
-                risk_level = 'lav'
-            elif e_fc <= ENERGY_THRESHOLD:
-                frac = (e_fc - ENERGY_WARN) / max(ENERGY_THRESHOLD - ENERGY_WARN, 1e-6)
-                mult = WIND_SIGMA_MULT_WARN + frac * (WIND_SIGMA_MULT_ALARM - WIND_SIGMA_MULT_WARN)
-                risk_level = 'advarsel'
-            else:
-                mult = WIND_SIGMA_MULT_ALARM
-                risk_level = 'alarm'
+            # Kontinuerlig multiplikator - ingen trinn ved tersklene. Nivået
+            # teller tersklene E ligger over (E lik terskelen hører til under).
+            mult = float(np.interp(e_fc, _SIGMA_MULT_E, _SIGMA_MULT_Y))
+            risk_level = str(_RISK_LEVELS[
+                np.searchsorted(_ENERGY_EDGES_MH, e_fc, side='left')])
 
             sigma_mult = 1.0 + (mult - 1.0) * horizon_w
             # Kun nedsiderisiko - vind gir aldri grunnlag for å anta varmere.
@@ -1992,6 +2571,10 @@ def build_fetsund_forecast(vorma_df, fetsund_df, discharge_df,
         })
 
     out = pd.DataFrame(rows)
+    # Gjentatte strengetiketter (én per rad, bare et par distinkte verdier)
+    # lagres som category: int8-koder i stedet for ett Python-strengobjekt per
+    # rad, både i minnet og i cachen.
+    out = out.astype({'mode': 'category', 'wind_risk_level': 'category'})
     out.attrs['mixing_fraction'] = round(f_mix, 3)
     out.attrs['kappa_source']    = kappa_src
     out.attrs['undisturbed_level'] = (round(fe_undist_now, 2)
@@ -2005,4 +2588,4 @@ def build_fetsund_forecast(vorma_df, fetsund_df, discharge_df,
     return out
 
 
-__all__ = ['CORE_VERSION', 'NVE_BASE_URL', 'FROST_CLIENT_ID', 'FROST_BASE_URL', 'STATION_SVANEFOSS', 'STATION_FUNNEFOSS_TEMP', 'STATION_ERTESEKKEN_Q', 'STATION_BLAKER', 'STATION_FUNNEFOSS_Q', 'STATION_FETSUND', 'FROST_STATION_KISE', 'MJOSA_LAT', 'MJOSA_LON', 'BINGSFOSSEN_LAT', 'BINGSFOSSEN_LON', 'FLOTERN_START_LAT', 'FLOTERN_START_LON', 'FETSUND_LAT', 'FETSUND_LON', 'TRANSPORT_COEFF', 'TRANSPORT_COEFF_BLA', 'TRANSPORT_COEFF_FLOTERN', 'REACH_FLOTERN_FETSUND_KM', 'FALLBACK_DISCHARGE', 'TEMPERATURE_SURVIVAL', 'MIXING_FRACTION_FALLBACK', 'DILUTION_ETA_EPISODE', 'DILUTION_ETA_INCREMENT', 'DISCHARGE_MIN_VALID', 'DISCHARGE_MAX_VALID', 'FALLBACK_DISCHARGE_GLOMMA', 'SIGMA_BASE', 'SIGMA_PER_DELTA', 'SIGMA_FLOOR', 'MODEL_SIGMA_ASYMPTOTE', 'SIGMA_EXTRAP_TAU', 'ANOMALY_SIGMA_EXTRAP_COLD', 'ANOMALY_SIGMA_EXTRAP_WARM', 'ANOMALY_SIGMA_BASE', 'ANOMALY_SIGMA_RAMP', 'UNDISTURBED_CAP_MARGIN', 'FORECAST_MODE', 'BASELINE_WINDOW_HOURS', 'BASELINE_QUANTILE', 'RELAX_TAU_FAST', 'RELAX_TAU_SLOW', 'RELAX_SLOW_FRACTION', 'RELAX_PERSISTENT', 'OFFSET_WINDOW_HOURS', 'OFFSET_WINDOW_MAX_H', 'OFFSET_QUIET_MAX_ANOM', 'OFFSET_MIN_SAMPLES', 'OFFSET_MAX_ABS', 'TAU_REF_HOURS', 'TAU_ATTEN_HOURS', 'ATTEN_MIN', 'ATTEN_MAX', 'MIXING_CAP_MARGIN', 'transport_attenuation', 'GAIN_REL_68_LOW', 'GAIN_REL_68_HIGH', 'GAIN_REL_95_LOW', 'GAIN_REL_95_HIGH', 'VORMA_BASELINE_HOURS', 'VORMA_RELAX_HOURS', 'MODEL_SIGMA', 'MODEL_SIGMA_DATA', 'TEMP_HIST_LOWER', 'TEMP_HIST_UPPER', 'WIND_SECTOR_MIN', 'WIND_SECTOR_MAX', 'WIND_WINDOW_HOURS', 'WIND_LEAD_HOURS', 'CRITICAL_WIND_SPEED', 'ENERGY_THRESHOLD', 'ENERGY_WARN', 'ENERGY_REF_PCTL', 'ENERGY_REF_MH', 'ENERGY_SOURCE_SCALE', 'ENERGY_PCTL_WARN', 'ENERGY_PCTL_ALARM', 'energy_from_percentile', 'energy_percentile', 'energy_risk_level', 'estimate_energy_scale', 'WIND_ANOMALY_SLOPE_EFF', 'WIND_RISK_HORIZON_HOURS', 'WIND_ANOMALY_SLOPE', 'WIND_ANOMALY_E_TYPISK', 'WIND_SIGMA_MULT_WARN', 'WIND_SIGMA_MULT_ALARM', 'SEICHE_WINDOW_START_DAYS', 'SEICHE_WINDOW_END_DAYS', 'SEICHE_COLD_THRESHOLD', 'SEICHE_ANOMALY_MIN', 'SEICHE_REBOUND_MIN', 'SEICHE_HISTORY_HOURS', 'OW_ABORT', 'OW_WETSUIT_REQUIRED', 'OW_WETSUIT_STRONG', 'OW_WETSUIT_OPTIONAL', 'OW_TOO_WARM', 'EVENT_YEAR', 'EVENT_MONTH', 'EVENT_DAY_OF_WEEK', 'fetch_nve_data', 'fetch_frost_wind', 'fetch_weather_forecast', 'add_southerly_component', 'detect_temperature_drop', 'calculate_travel_time', 'reach_current_speed', 'swim_assist', 'detect_seiche_risk', 'predict_fetsund_temperature', 'assess_risk_open_water', 'calculate_event_date', 'wind_rose_label', 'safe_discharge', 'mixing_fraction', 'dilution_kappa', 'undisturbed_baseline', 'relaxation_factor', 'build_wind_energy_series', 'build_fetsund_forecast', 'read_prediction_log', 'evaluate_prediction_log', 'summarize_prediction_skill', 'prediction_history_series', 'EVAL_HORIZONS', 'PREDICTION_LOG_SHEET_ID', 'PREDICTION_LOG_WORKSHEET']
+__all__ = ['CORE_VERSION', 'NVE_BASE_URL', 'FROST_CLIENT_ID', 'FROST_BASE_URL', 'STATION_SVANEFOSS', 'STATION_FUNNEFOSS_TEMP', 'STATION_ERTESEKKEN_Q', 'STATION_BLAKER', 'STATION_FUNNEFOSS_Q', 'STATION_FETSUND', 'FROST_STATION_KISE', 'MJOSA_LAT', 'MJOSA_LON', 'BINGSFOSSEN_LAT', 'BINGSFOSSEN_LON', 'FLOTERN_START_LAT', 'FLOTERN_START_LON', 'FETSUND_LAT', 'FETSUND_LON', 'TRANSPORT_COEFF', 'TRANSPORT_COEFF_BLA', 'TRANSPORT_COEFF_FLOTERN', 'REACH_FLOTERN_FETSUND_KM', 'FALLBACK_DISCHARGE', 'TEMPERATURE_SURVIVAL', 'MIXING_FRACTION_FALLBACK', 'DILUTION_ETA_EPISODE', 'DILUTION_ETA_INCREMENT', 'DISCHARGE_MIN_VALID', 'DISCHARGE_MAX_VALID', 'FALLBACK_DISCHARGE_GLOMMA', 'SIGMA_BASE', 'SIGMA_PER_DELTA', 'SIGMA_FLOOR', 'MODEL_SIGMA_ASYMPTOTE', 'SIGMA_EXTRAP_TAU', 'ANOMALY_SIGMA_EXTRAP_COLD', 'ANOMALY_SIGMA_EXTRAP_WARM', 'ANOMALY_SIGMA_BASE', 'ANOMALY_SIGMA_RAMP', 'UNDISTURBED_CAP_MARGIN', 'FORECAST_MODE', 'BASELINE_WINDOW_HOURS', 'BASELINE_QUANTILE', 'RELAX_TAU_FAST', 'RELAX_TAU_SLOW', 'RELAX_SLOW_FRACTION', 'RELAX_PERSISTENT', 'OFFSET_WINDOW_HOURS', 'OFFSET_WINDOW_MAX_H', 'OFFSET_QUIET_MAX_ANOM', 'OFFSET_MIN_SAMPLES', 'OFFSET_MAX_ABS', 'TAU_REF_HOURS', 'TAU_ATTEN_HOURS', 'ATTEN_MIN', 'ATTEN_MAX', 'MIXING_CAP_MARGIN', 'transport_attenuation', 'GAIN_REL_68_LOW', 'GAIN_REL_68_HIGH', 'GAIN_REL_95_LOW', 'GAIN_REL_95_HIGH', 'VORMA_BASELINE_HOURS', 'VORMA_RELAX_HOURS', 'MODEL_SIGMA', 'MODEL_SIGMA_DATA', 'TEMP_HIST_LOWER', 'TEMP_HIST_UPPER', 'WIND_SECTOR_MIN', 'WIND_SECTOR_MAX', 'WIND_WINDOW_HOURS', 'WIND_LEAD_HOURS', 'CRITICAL_WIND_SPEED', 'ENERGY_THRESHOLD', 'ENERGY_WARN', 'ENERGY_REF_PCTL', 'ENERGY_REF_MH', 'ENERGY_SOURCE_SCALE', 'ENERGY_PCTL_WARN', 'ENERGY_PCTL_ALARM', 'energy_from_percentile', 'energy_percentile', 'energy_risk_level', 'estimate_energy_scale', 'WIND_ANOMALY_SLOPE_EFF', 'WIND_RISK_HORIZON_HOURS', 'WIND_ANOMALY_SLOPE', 'WIND_ANOMALY_E_TYPISK', 'WIND_SIGMA_MULT_WARN', 'WIND_SIGMA_MULT_ALARM', 'SEICHE_WINDOW_START_DAYS', 'SEICHE_WINDOW_END_DAYS', 'SEICHE_COLD_THRESHOLD', 'SEICHE_ANOMALY_MIN', 'SEICHE_REBOUND_MIN', 'SEICHE_HISTORY_HOURS', 'OW_ABORT', 'OW_WETSUIT_REQUIRED', 'OW_WETSUIT_STRONG', 'OW_WETSUIT_OPTIONAL', 'OW_TOO_WARM', 'EVENT_YEAR', 'EVENT_MONTH', 'EVENT_DAY_OF_WEEK', 'API_CACHE_DIR', 'API_CACHE_TTL_NVE', 'API_CACHE_TTL_WEATHER', 'clear_disk_cache', 'fetch_concurrently', 'fetch_nve_data', 'fetch_nve_batch', 'fetch_frost_wind', 'fetch_weather_forecast', 'add_southerly_component', 'detect_temperature_drop', 'calculate_travel_time', 'reach_current_speed', 'swim_assist', 'detect_seiche_risk', 'predict_fetsund_temperature', 'southerly_wind_stats', 'nearest_time_index', 'assess_risk_open_water', 'calculate_event_date', 'wind_rose_label', 'safe_discharge', 'mixing_fraction', 'dilution_kappa', 'undisturbed_baseline', 'relaxation_factor', 'build_wind_energy_series', 'build_fetsund_forecast', 'read_prediction_log', 'evaluate_prediction_log', 'summarize_prediction_skill', 'prediction_history_series', 'EVAL_HORIZONS', 'PREDICTION_LOG_SHEET_ID', 'PREDICTION_LOG_WORKSHEET']
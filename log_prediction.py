@@ -32,7 +32,7 @@ import glommadyppen_core as core
 # Ark-ID og fanenavn er definert ETT sted (glommadyppen_core.py) slik at
 # skriving (her) og lesing (appen, via core.read_prediction_log) aldri kan
 # komme ut av synk.
-REQUIRED_CORE_VERSION = "1.11.4"
+REQUIRED_CORE_VERSION = "1.14.0"
 if getattr(core, "CORE_VERSION", None) != REQUIRED_CORE_VERSION:
     # Feil hardt og tidlig. Skriver vi til arket med en gammel kjerne, blir
     # loggen stille inkonsistent - noen rader med dynamisk κ, andre uten - og
@@ -83,43 +83,53 @@ def fetch_inputs():
     """Henter alle rådata-serier - identisk med page_prediksjon() i appen."""
     nve_key = os.environ.get("NVE_API_KEY")
 
-    # ÉN henting av Vorma-temperatur med det lengste vinduet som trengs (20 d
-    # for seiche-deteksjon); de siste 7 døgnene skjæres ut til prognosen.
-    vorma_history = core.fetch_nve_data(core.STATION_SVANEFOSS, 1003,
-                                        hours_back=core.SEICHE_HISTORY_HOURS,
-                                        api_key=nve_key)
+    # Alle hentingene er uavhengige og kjøres samtidig (som appens _fetch_all):
+    # samlet ventetid blir den tregeste enkelthentingen, ikke summen.
+    data = core.fetch_concurrently({
+        # ÉN henting av Vorma-temperatur med det lengste vinduet som trengs
+        # (20 d for seiche-deteksjon); de siste 7 døgnene skjæres ut til prognosen.
+        'vorma_history':  lambda: core.fetch_nve_data(
+            core.STATION_SVANEFOSS, 1003, hours_back=core.SEICHE_HISTORY_HOURS,
+            api_key=nve_key),
+        # 7-døgnsseriene samlet, én forespørsel per parameter. Glomma-
+        # temperaturen trengs til blandingsskranken (v1.11.4), Glomma-
+        # vannføringen til dynamisk uttynning.
+        'temp': lambda: core.fetch_nve_batch(
+            [core.STATION_FETSUND, core.STATION_FUNNEFOSS_TEMP], 1003, api_key=nve_key),
+        'q':    lambda: core.fetch_nve_batch(
+            [core.STATION_ERTESEKKEN_Q, core.STATION_FUNNEFOSS_Q], 1001, api_key=nve_key),
+        'frost_vind':     lambda: core.fetch_frost_wind(hours_back=168),
+        'weather_mjosa':  lambda: core.fetch_weather_forecast(core.MJOSA_LAT,
+                                                              core.MJOSA_LON),
+    })
+    vorma_history  = data['vorma_history']
+    fetsund_temp   = data['temp'][core.STATION_FETSUND]
+    funnefoss_temp = data['temp'][core.STATION_FUNNEFOSS_TEMP]
+    ertesekken_q   = data['q'][core.STATION_ERTESEKKEN_Q]
+    funnefoss_q    = data['q'][core.STATION_FUNNEFOSS_Q]
+    frost_vind     = data['frost_vind']
+    weather_mjosa  = data['weather_mjosa']
+
     # v1.11.4: fallbacken til Funnefoss er fjernet. Funnefoss (2.410.0) ligger i
     # GLOMMA, ikke i Vorma, og bærer ikke oppvellingssignalet. Å bruke den som
     # «Vorma» ga en logg som så normal ut mens kaldpulsen var usynlig.
     primary_df = vorma_history.copy()
     if not primary_df.empty:
-        cut = pd.to_datetime(primary_df['time']).max() - pd.Timedelta(hours=168)
-        primary_df = primary_df[pd.to_datetime(primary_df['time']) >= cut] \
-                         .reset_index(drop=True)
-
-    fetsund_temp = core.fetch_nve_data(core.STATION_FETSUND, 1003, hours_back=168, api_key=nve_key)
-    ertesekken_q = core.fetch_nve_data(core.STATION_ERTESEKKEN_Q, 1001, hours_back=168, api_key=nve_key)
-    # Glomma-vannføring - nødvendig for dynamisk uttynning
-    funnefoss_q  = core.fetch_nve_data(core.STATION_FUNNEFOSS_Q, 1001, hours_back=168, api_key=nve_key)
-    # Glomma-temperatur - blandingsskranken (v1.11.4)
-    funnefoss_temp = core.fetch_nve_data(core.STATION_FUNNEFOSS_TEMP, 1003, hours_back=168, api_key=nve_key)
-    frost_vind   = core.fetch_frost_wind(hours_back=168)
-    weather_mjosa = core.fetch_weather_forecast(core.MJOSA_LAT, core.MJOSA_LON)
-    if not weather_mjosa.empty:
-        weather_mjosa = core.add_southerly_component(weather_mjosa)
+        cut = primary_df['time'].max() - pd.Timedelta(hours=168)
+        primary_df = primary_df[primary_df['time'] >= cut].reset_index(drop=True)
 
     return (primary_df, fetsund_temp, ertesekken_q, funnefoss_q,
             frost_vind, weather_mjosa, vorma_history, funnefoss_temp)
 
 
-def nearest_forecast_row(forecast_df, target_h):
+def nearest_forecast_row(forecast_df, target_h, now_utc=None):
     """Finn forecast_df-raden nærmest target_h timer frem i tid (samme grid som build_fetsund_forecast)."""
     if forecast_df is None or forecast_df.empty:
         return None
-    now_utc = pd.Timestamp.now(tz='UTC')
+    if now_utc is None:
+        now_utc = pd.Timestamp.now(tz='UTC')
     target_t = now_utc + timedelta(hours=target_h)
-    idx = (forecast_df['time'] - target_t).abs().idxmin()
-    return forecast_df.loc[idx]
+    return forecast_df.iloc[core.nearest_time_index(forecast_df['time'], target_t)]
 
 
 def build_snapshot():
@@ -135,16 +145,16 @@ def build_snapshot():
     event_date = core.calculate_event_date(core.EVENT_YEAR)
     days_until = (event_date - now_utc).days
 
-    latest_vorma = primary_df.iloc[-1]['value']
+    latest_vorma = primary_df['value'].iat[-1]
     # 72t MEDIAN (ikke 48t mean): robust mot at en kaldpuls passerer gjennom
     # selve baselinevinduet og gjør anomalien falskt positiv.
     vorma_baseline = primary_df[
-        pd.to_datetime(primary_df['time'])
+        primary_df['time']
         >= primary_df['time'].max() - timedelta(hours=core.VORMA_BASELINE_HOURS)
     ]['value'].median()
     vorma_anomaly = latest_vorma - vorma_baseline
 
-    fetsund_now = fetsund_temp.iloc[-1]['value'] if not fetsund_temp.empty else float('nan')
+    fetsund_now = fetsund_temp['value'].iat[-1] if not fetsund_temp.empty else float('nan')
     fetsund_baseline = (
         fetsund_temp[fetsund_temp['time'] >= fetsund_temp['time'].max() - timedelta(hours=48)]['value'].median()
         if not fetsund_temp.empty else float('nan')
@@ -154,9 +164,9 @@ def build_snapshot():
     q_glomma, _ = core.safe_discharge(funnefoss_q, core.FALLBACK_DISCHARGE_GLOMMA)
     kappa_ep, f_mix, kappa_src = core.dilution_kappa(ertesekken_q, funnefoss_q, mode='episode')
     kappa_in, _, _             = core.dilution_kappa(ertesekken_q, funnefoss_q, mode='increment')
-    seiche = core.detect_seiche_risk(vorma_history)
+    seiche = core.detect_seiche_risk(vorma_history, now=now_utc)
 
-    energy_df = core.build_wind_energy_series(frost_vind, weather_mjosa)
+    energy_df = core.build_wind_energy_series(frost_vind, weather_mjosa, now=now_utc)
     wind_e_now = None
     if not energy_df.empty:
         obs_e = energy_df[~energy_df['is_forecast']]
@@ -168,7 +178,7 @@ def build_snapshot():
     forecast_df = core.build_fetsund_forecast(
         primary_df, fetsund_temp, ertesekken_q,
         glomma_q_df=funnefoss_q, glomma_temp_df=funnefoss_temp,
-        energy_df=energy_df,
+        energy_df=energy_df, now=now_utc,
     )
     _fa = forecast_df.attrs if forecast_df is not None else {}
     forecast_mode = forecast_df['mode'].iloc[0] if not forecast_df.empty else None
@@ -214,7 +224,7 @@ def build_snapshot():
     }
 
     for h in LOG_HORIZONS_H:
-        r = nearest_forecast_row(forecast_df, h)
+        r = nearest_forecast_row(forecast_df, h, now_utc)
         if r is None:
             row.update({f"predicted_h{h}": None, f"lower68_h{h}": None,
                         f"upper68_h{h}": None, f"windE_fc_h{h}": None,
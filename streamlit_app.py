@@ -7,10 +7,8 @@ Date: 2026
 """
 
 import streamlit as st
-from PIL import Image
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
@@ -78,7 +76,7 @@ st.set_page_config(
 # melding om nøyaktig hva som er ute av synk.
 # ============================================================================
 
-REQUIRED_CORE_VERSION = "1.11.4"
+REQUIRED_CORE_VERSION = "1.14.0"
 
 _REQUIRED_CORE_ATTRS = [
     # v1.7 - dynamisk uttynning og robusthet
@@ -101,6 +99,16 @@ _REQUIRED_CORE_ATTRS = [
     # v1.11 - strømhastighet og drahjelp på løpsstrekket
     "REACH_FLOTERN_FETSUND_KM", "reach_current_speed", "swim_assist",
     "FLOTERN_START_LAT", "FLOTERN_START_LON",
+    # v1.12 - diskcache for API-svar
+    "API_CACHE_DIR", "clear_disk_cache",
+    # v1.12.1 - samtidige hentinger
+    "fetch_concurrently",
+    # v1.12.2 - vindnøkkeltall regnes én gang
+    "southerly_wind_stats",
+    # v1.12.3 - binærsøk etter nærmeste prognoserad
+    "nearest_time_index",
+    # v1.13 - samlede NVE-forespørsler
+    "fetch_nve_batch",
 ]
 
 
@@ -171,7 +179,7 @@ def _check_core_version():
             language=None)
     st.markdown(
         "Sjekk at nettopp *denne* filen er den du lastet opp. Riktig fil har "
-        "`CORE_VERSION = \"1.11.4\"` på linje 30 og er cirka 1 550 linjer lang. "
+        "`CORE_VERSION = \"1.14.0\"` på linje 55 og er cirka 2 500 linjer lang. "
         "Ligger det flere kopier i repoet, er det stien over som gjelder."
     )
 
@@ -200,30 +208,98 @@ except (KeyError, FileNotFoundError):
 # DATA FETCHING
 # Tynne, Streamlit-cachede wrappere rundt glommadyppen_core sine funksjoner.
 # All faktisk hente-logikk bor i glommadyppen_core.py.
+#
+# show_spinner=False: sidene viser én samlet «Henter …»-spinner rundt
+# hentingene. Uten dette la hvert cachede kall sin egen spinner oppå, og
+# hver av dem ga en ekstra DOM-oppdatering når kallet var ferdig.
+#
+# API-rammene caches med st.cache_resource: cache_data pickler og unpickler
+# hele rammen ved HVERT treff, mens cache_resource gir tilbake selve objektet.
+# Rammene deles da mellom alle økter og må regnes som skrivebeskyttet - den
+# som vil legge til kolonner, tar .copy() eller .assign() først.
+#
+# max_entries: treffsikkerhetssiden henter med et hours_back som følger
+# loggens lengde, så nøklene er ikke et fast sett. Taket hindrer at gamle
+# rammer blir liggende i minnet til ttl-en går ut.
 # ============================================================================
 
-@st.cache_data(ttl=3600)
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=64)
 def fetch_nve_data(station_id, parameter, hours_back=168):
     return _core.fetch_nve_data(station_id, parameter, hours_back, api_key=NVE_API_KEY)
 
 
-@st.cache_data(ttl=3600)
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=64)
+def fetch_nve_batch(station_ids, parameter, hours_back=168):
+    """Flere stasjoner, samme parameter, ett kall (station_ids som tuple)."""
+    return _core.fetch_nve_batch(list(station_ids), parameter, hours_back,
+                                 api_key=NVE_API_KEY)
+
+
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=64)
 def fetch_frost_wind(hours_back=168):
     return _core.fetch_frost_wind(hours_back)
 
 
-@st.cache_data(ttl=1800)
+@st.cache_data(ttl=1800, show_spinner=False)
 def read_prediction_log():
     """Prediksjonsloggen fra Google Sheets. Cachet i 30 min - den oppdateres
     bare én gang i døgnet av GitHub Actions-jobben."""
     return _core.read_prediction_log()
 
 
-@st.cache_data(ttl=21600)
+@st.cache_resource(ttl=21600, show_spinner=False, max_entries=64)
 def fetch_weather_forecast(lat, lon, days_ahead=14):
+    """Met.no-varselet. southerly_wind er garantert lagt på i core ved inntak,
+    så varselrammene sendes rett videre uten add_southerly_component()."""
     return _core.fetch_weather_forecast(lat, lon, days_ahead)
 
 
+def _fetch_all(jobs):
+    """
+    Kjører de cachede hentewrapperne over samtidig (se core.fetch_concurrently).
+
+    Arbeidertrådene knyttes til skriptets ScriptRunContext, ellers finner ikke
+    st.cache_resource-wrapperne økten og logger «missing ScriptRunContext» for
+    hvert kall.
+    """
+    import threading
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return _core.fetch_concurrently(
+        jobs, initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx))
+
+
+
+# ============================================================================
+# PREDIKSJONSLAG
+# Modellfunksjonene er rene funksjoner av de cachede DataFrame-ene, men
+# ble kjørt på nytt ved hver interaksjon (knappetrykk, fanebytte). Cachede
+# wrappere gjør at en rerun med samme data blir et oppslag. Kort ttl fordi
+# resultatene også avhenger av «nå» (prognoseankeret, seiche-dager igjen).
+# ============================================================================
+
+@st.cache_data(ttl=600, show_spinner=False)
+def detect_seiche_risk(vorma_df, hours_back_history=None, now=None):
+    return _core.detect_seiche_risk(vorma_df, hours_back_history, now=now)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def detect_temperature_drop(df, threshold_C=2.0, window_hours=6):
+    return _core.detect_temperature_drop(df, threshold_C=threshold_C,
+                                         window_hours=window_hours)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def build_wind_energy_series(frost_df, forecast_df, window_hours=None, lead_hours=None,
+                             now=None):
+    return _core.build_wind_energy_series(frost_df, forecast_df,
+                                          window_hours, lead_hours, now=now)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def build_fetsund_forecast(vorma_df, fetsund_df, discharge_df, **kwargs):
+    return _core.build_fetsund_forecast(vorma_df, fetsund_df, discharge_df, **kwargs)
+
 
 # ============================================================================
 # VISUALIZATION HELPERS
@@ -232,12 +308,65 @@ def fetch_weather_forecast(lat, lon, days_ahead=14):
 
 _LAYOUT_BASE = dict(
     hovermode='x unified',
+    # Fast uirevision: Plotly beholder zoom/panorering mellom reruns i stedet
+    # for å tegne aksene på nytt hver gang en widget endres.
+    uirevision='glommadyppen',
     template='plotly_white',
     margin=dict(l=50, r=20, t=50, b=40),
     legend=dict(orientation="h", yanchor="bottom", y=1.02,
                 xanchor="center", x=0.5, font=dict(size=10)),
 )
 
+def _f32(values):
+    """
+    Serie → sammenhengende float32-array for Plotly-traces.
+
+    plotly.py ≥ 6 sender numpy-arrays som base64-kodede typed arrays i stedet
+    for én JSON-tekststreng per tall, og float32 halverer nyttelasten. Med
+    eldre plotly blir arrayen serialisert som før, så endringen er ufarlig.
+    """
+    return np.ascontiguousarray(pd.to_numeric(values, errors='coerce'),
+                                dtype=np.float32)
+
+
+_MAX_PLOT_POINTS = 500   # over dette tynnes linjeserier ut med LTTB
+
+
+def _lttb_index(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: velger `n_out` punkter som bevarer
+    kurveformen (topper og bunner) når en lang serie tynnes ut. Returnerer
+    posisjonsindekser i stigende rekkefølge. Første og siste punkt beholdes.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        nxt_lo, nxt_hi = hi, (edges[k + 2] if k + 2 < len(edges) else n)
+        cx = x[nxt_lo:nxt_hi].mean()
+        cy = np.nanmean(y[nxt_lo:nxt_hi]) if np.isfinite(y[nxt_lo:nxt_hi]).any() else y[a]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) -
+                      (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + (int(np.nanargmax(area)) if np.isfinite(area).any() else 0)
+        out[k + 1] = a
+    return out
+
+
+def _downsample(df, col, n_out=_MAX_PLOT_POINTS):
+    """Tynner ut df til maks n_out rader med LTTB på `col` (kort df urørt)."""
+    if len(df) <= n_out:
+        return df
+    x = pd.to_datetime(df['time']).values.astype('datetime64[ns]').view('int64')
+    return df.iloc[_lttb_index(x, pd.to_numeric(df[col], errors='coerce'), n_out)]
+
+
 STATION_COLORS = {
     'Svanefoss':  '#4472C4',
     'Funnefoss':  '#2E86AB',
@@ -247,14 +376,28 @@ STATION_COLORS = {
 }
 
 
+# Tidsseriene i graf-byggerne under tegnes med WebGL (Scattergl): SVG-sporene
+# tegnes om i DOM-en ved hver rerun og blir merkbart trege når flere stasjoner
+# og én markør per time ligger i samme figur.
+#
+# Graf- og tabellbyggerne som bare avhenger av de hentede rammene, er cachet
+# med samme ttl som hentingene: en rerun med uendrede data gir da ferdig figur
+# i stedet for ny LTTB-uttynning og nye Plotly-spor. Standard-hashingen av
+# små DataFrames er ett vektorisert gjennomløp, så nøkkelen er billig og
+# følger innholdet. _forecast_chart og _wind_energy_chart tegner «nå»-linjer
+# og får derfor nå-tidspunktet som argument, avrundet til hele minutter: det
+# inngår i nøkkelen, så figuren bygges på nytt høyst én gang i minuttet.
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _temp_chart(stations_dict, title="Vanntemperatur"):
     fig = go.Figure()
     for name, df in stations_dict.items():
         if df is None or df.empty:
             continue
         col = 'value' if 'value' in df.columns else df.columns[1]
-        fig.add_trace(go.Scatter(
-            x=df['time'], y=df[col], mode='lines', name=name,
+        df = _downsample(df, col)
+        fig.add_trace(go.Scattergl(
+            x=df['time'], y=_f32(df[col]), mode='lines', name=name,
             line=dict(color=STATION_COLORS.get(name, '#888'), width=2),
         ))
     for temp, label, color in [(16, "16 °C – WA minimum", "red"),
@@ -267,14 +410,16 @@ def _temp_chart(stations_dict, title="Vanntemperatur"):
     return fig
 
 
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _discharge_chart(stations_dict, title="Vannføring"):
     fig = go.Figure()
     for name, df in stations_dict.items():
         if df is None or df.empty:
             continue
         col = 'value' if 'value' in df.columns else df.columns[1]
-        fig.add_trace(go.Scatter(
-            x=df['time'], y=df[col], mode='lines', name=name,
+        df = _downsample(df, col)
+        fig.add_trace(go.Scattergl(
+            x=df['time'], y=_f32(df[col]), mode='lines', name=name,
             line=dict(color=STATION_COLORS.get(name, '#888'), width=2),
         ))
     fig.update_layout(title=title, xaxis_title="Tid", yaxis_title="m³/s",
@@ -282,29 +427,48 @@ def _discharge_chart(stations_dict, title="Vannføring"):
     return fig
 
 
+def _ses_mask(df):
+    """
+    SE/S-sektormasken som bool-array (samme grenser som modellen). Regnes én
+    gang per ramme og deles av linjesporet, markørfargene og nøkkeltallene.
+    """
+    if 'wind_direction' not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    wd = pd.to_numeric(df['wind_direction'], errors='coerce').to_numpy(
+        dtype=np.float64, na_value=np.nan)
+    return (wd >= WIND_SECTOR_MIN) & (wd <= WIND_SECTOR_MAX)
+
+
+def _sector_colors(is_ses):
+    return np.where(is_ses, '#D62828', '#AAAAAA')
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _wind_obs_chart(df, title="Vindmålinger"):
     if df.empty or 'wind_speed' not in df.columns:
         return None
     fig = make_subplots(rows=2, cols=1, vertical_spacing=0.12,
                         subplot_titles=('Vindhastighet (m/s)', 'Vindretning (°)'))
-    is_ses = ((df.get('wind_direction', pd.Series(dtype=float)) >= WIND_SECTOR_MIN) &
-              (df.get('wind_direction', pd.Series(dtype=float)) <= WIND_SECTOR_MAX))
-    ses_speed = np.where(is_ses, df['wind_speed'], np.nan)
-    fig.add_trace(go.Scatter(
-        x=df['time'], y=df['wind_speed'], mode='lines', name='Total vind',
+    is_ses = _ses_mask(df)
+    # Bakgrunnslinjen for total vind tynnes ut med LTTB som de andre
+    # tidsseriene; SE/S-sporet og retningsmarkørene beholder full oppløsning.
+    total = _downsample(df, 'wind_speed')
+    fig.add_trace(go.Scattergl(
+        x=total['time'], y=_f32(total['wind_speed']), mode='lines', name='Total vind',
         line=dict(color='#06A77D', width=1.5), fill='tozeroy',
         fillcolor='rgba(6,167,125,0.12)'), row=1, col=1)
-    fig.add_trace(go.Scatter(
-        x=df['time'], y=ses_speed, mode='lines', name='SE/S-vind',
-        line=dict(color='#D62828', width=1.5, dash='dot')), row=1, col=1)
+    # Uten ett eneste SE/S-punkt ville sporet bare vært NaN: det droppes.
+    if is_ses.any():
+        fig.add_trace(go.Scattergl(
+            x=df['time'], y=_f32(np.where(is_ses, df['wind_speed'], np.nan)),
+            mode='lines', name='SE/S-vind',
+            line=dict(color='#D62828', width=1.5, dash='dot')), row=1, col=1)
     fig.add_hline(y=CRITICAL_WIND_SPEED, line_dash="dot", line_color="red",
                   annotation_text=f"{CRITICAL_WIND_SPEED} m/s terskel", row=1, col=1)
     if 'wind_direction' in df.columns:
-        is_ses_bool = is_ses.values if hasattr(is_ses, 'values') else is_ses
-        marker_colors = ['#D62828' if s else '#AAAAAA' for s in is_ses_bool]
-        fig.add_trace(go.Scatter(
-            x=df['time'], y=df['wind_direction'], mode='markers', name='Retning',
-            marker=dict(size=5, color=marker_colors),
+        fig.add_trace(go.Scattergl(
+            x=df['time'], y=_f32(df['wind_direction']), mode='markers', name='Retning',
+            marker=dict(size=5, color=_sector_colors(is_ses)),
             hovertemplate='%{y:.0f}°<extra></extra>'), row=2, col=1)
         fig.add_hrect(y0=WIND_SECTOR_MIN, y1=WIND_SECTOR_MAX,
                       fillcolor="rgba(214,40,40,0.08)", line_width=0,
@@ -315,30 +479,28 @@ def _wind_obs_chart(df, title="Vindmålinger"):
     return fig
 
 
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _wind_forecast_chart(df, title="Vindvarsel"):
     if df.empty or 'wind_speed' not in df.columns:
         return None
-    df = df.copy()
-    if 'southerly_wind' not in df.columns:
-        df = add_southerly_component(df)
+    is_ses = _ses_mask(df)
     fig = make_subplots(rows=2, cols=1, vertical_spacing=0.12,
                         subplot_titles=('Vindhastighet (m/s)', 'Vindretning (°)'))
-    fig.add_trace(go.Scatter(
-        x=df['time'], y=df['wind_speed'], mode='lines', name='Total vind',
+    fig.add_trace(go.Scattergl(
+        x=df['time'], y=_f32(df['wind_speed']), mode='lines', name='Total vind',
         line=dict(color='#2E86AB', width=1.5), fill='tozeroy',
         fillcolor='rgba(46,134,171,0.12)'), row=1, col=1)
-    fig.add_trace(go.Scatter(
-        x=df['time'], y=df['southerly_wind'], mode='lines', name='SE/S-vind',
-        line=dict(color='#D62828', width=1.5, dash='dot')), row=1, col=1)
+    # SE/S-sporet er en flat null når ingen varslede timer ligger i sektoren.
+    if is_ses.any():
+        fig.add_trace(go.Scattergl(
+            x=df['time'], y=_f32(df['southerly_wind']), mode='lines', name='SE/S-vind',
+            line=dict(color='#D62828', width=1.5, dash='dot')), row=1, col=1)
     fig.add_hline(y=CRITICAL_WIND_SPEED, line_dash="dot", line_color="red",
                   annotation_text=f"{CRITICAL_WIND_SPEED} m/s terskel", row=1, col=1)
     if 'wind_direction' in df.columns:
-        is_ses = ((df['wind_direction'] >= WIND_SECTOR_MIN) &
-                  (df['wind_direction'] <= WIND_SECTOR_MAX))
-        marker_colors = ['#D62828' if s else '#AAAAAA' for s in is_ses]
-        fig.add_trace(go.Scatter(
-            x=df['time'], y=df['wind_direction'], mode='markers', name='Retning',
-            marker=dict(size=5, color=marker_colors),
+        fig.add_trace(go.Scattergl(
+            x=df['time'], y=_f32(df['wind_direction']), mode='markers', name='Retning',
+            marker=dict(size=5, color=_sector_colors(is_ses)),
             hovertemplate='%{y:.0f}°<extra></extra>'), row=2, col=1)
         fig.add_hrect(y0=WIND_SECTOR_MIN, y1=WIND_SECTOR_MAX,
                       fillcolor="rgba(214,40,40,0.08)", line_width=0,
@@ -349,6 +511,7 @@ def _wind_forecast_chart(df, title="Vindvarsel"):
     return fig
 
 
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _weather_fetsund_chart(df, title="Værvarsler – Fetsund"):
     if df.empty or 'wind_speed' not in df.columns:
         return None
@@ -356,64 +519,112 @@ def _weather_fetsund_chart(df, title="Værvarsler – Fetsund"):
         rows=3, cols=1, vertical_spacing=0.10,
         subplot_titles=('Lufttemperatur (°C)', 'Vindhastighet (m/s)', 'Nedbør (mm/t)')
     )
-    fig.add_trace(go.Scatter(
-        x=df['time'], y=df['air_temperature'], mode='lines', name='Lufttemp',
+    fig.add_trace(go.Scattergl(
+        x=df['time'], y=_f32(df['air_temperature']), mode='lines', name='Lufttemp',
         line=dict(color='#E67E22', width=1.5)), row=1, col=1)
-    fig.add_trace(go.Scatter(
-        x=df['time'], y=df['wind_speed'], mode='lines', name='Vind',
+    fig.add_trace(go.Scattergl(
+        x=df['time'], y=_f32(df['wind_speed']), mode='lines', name='Vind',
         line=dict(color='#2E86AB', width=1.5), fill='tozeroy',
         fillcolor='rgba(46,134,171,0.12)'), row=2, col=1)
     if 'precipitation' in df.columns:
         fig.add_trace(go.Bar(
-            x=df['time'], y=df['precipitation'], name='Nedbør',
+            x=df['time'], y=_f32(df['precipitation']), name='Nedbør',
             marker_color='rgba(70,130,180,0.6)'), row=3, col=1)
     fig.update_layout(title=title, height=520, showlegend=False, **_LAYOUT_BASE)
     return fig
 
 
+def _daily_agg(df, days, **aggs):
+    """
+    Døgnaggregater (Oslo-dato) for de første `days` dagene i ett groupby-
+    gjennomløp, i stedet for et boolsk filter per dag.
+    """
+    dates = pd.to_datetime(df['time']).dt.tz_convert('Europe/Oslo').dt.date
+    agg = df.groupby(dates.rename('date'), sort=True).agg(**aggs).head(days)
+    agg['Dato'] = pd.to_datetime(agg.index).strftime('%a %d.%m')
+    return agg
+
+
+def _fmt(values, spec):
+    return [format(v, spec) for v in values]
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _daily_forecast_table(df, days=10):
     if df.empty:
         return None
-    df = df.copy()
-    if 'southerly_wind' not in df.columns:
-        df = add_southerly_component(df)
-    df['date'] = pd.to_datetime(df['time']).dt.tz_convert('Europe/Oslo').dt.date
-    rows = []
-    for date in sorted(df['date'].unique())[:days]:
-        d     = df[df['date'] == date]
-        avg_s = d['southerly_wind'].mean()
-        risiko_ikon = ("🔴" if avg_s >= CRITICAL_WIND_SPEED else
-                       "🟡" if avg_s >= 1.2 else "🟢")
-        rows.append({
-            'Dato':          pd.to_datetime(date).strftime('%a %d.%m'),
-            'Lufttemp':      f"{d['air_temperature'].min():.0f}–{d['air_temperature'].max():.0f} °C",
-            'Vind gj.snitt': f"{d['wind_speed'].mean():.1f} m/s",
-            'Vind maks':     f"{d['wind_speed'].max():.1f} m/s",
-            'Retning':       f"{d['wind_direction'].mean():.0f}° ({wind_rose_label(d['wind_direction'].mean())})",
-            'SE/S-vind':     f"{avg_s:.1f} m/s",
-            'Oppv.risiko':   risiko_ikon,
-        })
-    return pd.DataFrame(rows)
-
-
+    # Retningen midles som vektor (sirkulært gjennomsnitt): aritmetisk snitt
+    # av 350° og 10° gir 180° - stikk motsatt vei - i stedet for 0°.
+    rad = np.deg2rad(pd.to_numeric(df['wind_direction'], errors='coerce')
+                     .to_numpy(dtype=np.float64, na_value=np.nan))
+    df = df.assign(_dir_sin=np.sin(rad), _dir_cos=np.cos(rad))
+    agg = _daily_agg(df, days,
+                     t_min=('air_temperature', 'min'), t_max=('air_temperature', 'max'),
+                     w_mean=('wind_speed', 'mean'), w_max=('wind_speed', 'max'),
+                     d_sin=('_dir_sin', 'mean'), d_cos=('_dir_cos', 'mean'),
+                     s_mean=('southerly_wind', 'mean'))
+    agg['d_mean'] = np.rad2deg(np.arctan2(agg['d_sin'], agg['d_cos'])) % 360
+    avg_s = agg['s_mean'].to_numpy()
+    return pd.DataFrame({
+        'Dato':          agg['Dato'].to_numpy(),
+        'Lufttemp':      [f"{lo:.0f}–{hi:.0f} °C" for lo, hi in zip(agg['t_min'], agg['t_max'])],
+        'Vind gj.snitt': [f"{v} m/s" for v in _fmt(agg['w_mean'], '.1f')],
+        'Vind maks':     [f"{v} m/s" for v in _fmt(agg['w_max'], '.1f')],
+        'Retning':       [f"{d:.0f}° ({lbl})" if np.isfinite(d) else "–" for d, lbl in
+                          zip(agg['d_mean'], wind_rose_label(agg['d_mean'].to_numpy()))],
+        'SE/S-vind':     [f"{v} m/s" for v in _fmt(avg_s, '.1f')],
+        'Oppv.risiko':   np.where(avg_s >= CRITICAL_WIND_SPEED, "🔴",
+                                  np.where(avg_s >= 1.2, "🟡", "🟢")),
+    })
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _daily_forecast_table_fetsund(df, days=10):
     if df.empty:
         return None
-    df = df.copy()
-    df['date'] = pd.to_datetime(df['time']).dt.tz_convert('Europe/Oslo').dt.date
+    aggs = dict(t_min=('air_temperature', 'min'), t_max=('air_temperature', 'max'),
+                w_mean=('wind_speed', 'mean'), w_max=('wind_speed', 'max'))
+    if 'precipitation' in df.columns:
+        aggs['p_sum'] = ('precipitation', 'sum')
+    agg = _daily_agg(df, days, **aggs)
+    return pd.DataFrame({
+        'Dato':          agg['Dato'].to_numpy(),
+        'Lufttemp':      [f"{lo:.0f}–{hi:.0f} °C" for lo, hi in zip(agg['t_min'], agg['t_max'])],
+        'Vind gj.snitt': [f"{v} m/s" for v in _fmt(agg['w_mean'], '.1f')],
+        'Vind maks':     [f"{v} m/s" for v in _fmt(agg['w_max'], '.1f')],
+        'Nedbør':        ([f"{v} mm" for v in _fmt(agg['p_sum'], '.1f')]
+                          if 'p_sum' in agg.columns else "–"),
+    })
+
+
+# Egenfartene i svømmetidstabellen: (sekunder per 100 m, visningstekst).
+_SWIM_PACES = ((80, "1:20"), (100, "1:40"), (120, "2:00"),
+               (150, "2:30"), (180, "3:00"))
+
+
+def _hms(sec):
+    sec = int(round(sec))
+    return f"{sec // 3600}:{(sec % 3600) // 60:02d}:{sec % 60:02d}"
+
+
+# Tabellen avhenger bare av sliderverdien og konstanter, så den trenger ingen
+# ttl: hver vannføring bygges én gang per prosess.
+@st.cache_data(show_spinner=False, max_entries=64)
+def _swim_assist_table(q_val):
     rows = []
-    for date in sorted(df['date'].unique())[:days]:
-        d = df[df['date'] == date]
-        precip_sum = d['precipitation'].sum() if 'precipitation' in d.columns else None
-        precip_str = f"{precip_sum:.1f} mm" if precip_sum is not None else "–"
+    for pace_s, pace_lbl in _SWIM_PACES:
+        a = swim_assist(q_val, pace_s)
+        if a is None:
+            continue
         rows.append({
-            'Dato':          pd.to_datetime(date).strftime('%a %d.%m'),
-            'Lufttemp':      f"{d['air_temperature'].min():.0f}–{d['air_temperature'].max():.0f} °C",
-            'Vind gj.snitt': f"{d['wind_speed'].mean():.1f} m/s",
-            'Vind maks':     f"{d['wind_speed'].max():.1f} m/s",
-            'Nedbør':        precip_str,
+            "Egenfart (min/100 m)":  pace_lbl,
+            "Egenfart (m/s)":        f"{a['v_swim']:.2f}",
+            "Med strøm (m/s)":       f"{a['v_total']:.2f}",
+            "Tid uten strøm":        _hms(a['t_still']),
+            "Tid med strøm":         _hms(a['t_current']),
+            "Spart":                 f"{_hms(a['gain'])}  ({a['gain_pct']:.0f} %)",
         })
-    return pd.DataFrame(rows)
+    return pd.DataFrame(rows) if rows else None
 
 
 
@@ -513,6 +724,9 @@ def _inject_mobile_css():
     /* Skjul hint på desktop */
     .gd-mobile-hint { display: none; }
 
+    /* Logo i sidepanelet */
+    .gd-logo img { width: 100%; cursor: pointer; }
+
     @media screen and (max-width: 480px) {
         /* Svært smal skjerm (eldre telefoner): én kolonne */
         [data-testid="column"] {
@@ -524,24 +738,45 @@ def _inject_mobile_css():
     </style>
     """, unsafe_allow_html=True)
 
+@st.cache_resource(show_spinner=False)
+def _logo_html():
+    """
+    Logo-lenken for sidepanelet, bygget én gang per prosess. Bildet er over
+    1 MB, og ble tidligere lest fra disk og base64-kodet på hver eneste rerun.
+    Stilen ligger i .gd-logo i _inject_mobile_css(), ikke inline.
+
+    Mangler filen (eller er repoet sjekket ut uten den), returneres None og
+    appen viser bare en tekstlenke - det skal IKKE ta ned hele appen.
+    """
+    import base64
+    try:
+        with open('Samensatt_logo_GlommDyppen.jpg', 'rb') as f:
+            logo_b64 = base64.b64encode(f.read()).decode()
+    except OSError:
+        return None
+    return ('<a class="gd-logo" href="https://glommadyppen.no" target="_blank">'
+            f'<img src="data:image/jpeg;base64,{logo_b64}"></a>')
+
+
 # ============================================================================
 # WIND ENERGY FUNCTIONS
 # ============================================================================
 
 
-
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _wind_energy_chart(energy_df,
-                       title="Kumulativ SE/S-vindenergi – oppvellingsrisiko"):
+                       title="Kumulativ SE/S-vindenergi – oppvellingsrisiko",
+                       now_utc=None):
     if energy_df is None or energy_df.empty:
         return None
 
-    obs = energy_df[~energy_df['is_forecast']].copy()
-    fc  = energy_df[ energy_df['is_forecast']].copy()
-    now_utc = pd.Timestamp.now(tz='UTC')
+    obs = energy_df[~energy_df['is_forecast']]
+    fc  = energy_df[ energy_df['is_forecast']]
+    if now_utc is None:
+        now_utc = pd.Timestamp.now(tz='UTC')
 
     if not obs.empty and not fc.empty:
-        bridge = obs.iloc[-1:].copy()
-        bridge['is_forecast'] = True
+        bridge = obs.iloc[-1:].assign(is_forecast=True)
         fc = pd.concat([bridge, fc]).reset_index(drop=True)
 
     e_max = max(float(energy_df['E'].max()),
@@ -584,12 +819,15 @@ def _wind_energy_chart(energy_df,
                   annotation_position='right', annotation_font_size=10,
                   annotation_font_color='rgba(110,110,110,0.70)', row=1, col=1)
 
+    # E-linjene tegnes med WebGL som tidsseriene ellers. Usikkerhetsbåndet blir
+    # SVG: fill='toself'-polygoner tegnes ikke pålitelig av Scattergl.
     if not fc.empty:
         t_fwd = list(fc['time'])
         t_rev = list(fc['time'])[::-1]
         fig.add_trace(go.Scatter(
             x=t_fwd + t_rev,
-            y=list(fc['E_upper']) + list(fc['E_lower'])[::-1],
+            y=np.concatenate([_f32(fc['E_upper']),
+                              _f32(fc['E_lower'])[::-1]]),
             fill='toself', fillcolor='rgba(56,141,228,0.13)',
             line=dict(color='rgba(0,0,0,0)', width=0),
             name='Usikkerhet (±1σ)', hoverinfo='skip',
@@ -599,19 +837,19 @@ def _wind_energy_chart(energy_df,
     # plassering ved siden av absoluttverdien. Uten den må leseren selv vite at
     # 90 m·h er sjeldent og 30 m·h er helt normalt.
     if not obs.empty:
-        obs['pctl'] = [energy_percentile(v) or 0.0 for v in obs['E']]
-        fig.add_trace(go.Scatter(
-            x=obs['time'], y=obs['E'], mode='lines', name='E (Frost-obs)',
-            line=dict(color='#185FA5', width=2), customdata=obs['pctl'],
+        obs_pctl = np.nan_to_num(energy_percentile(obs['E']), nan=0.0)
+        fig.add_trace(go.Scattergl(
+            x=obs['time'], y=_f32(obs['E']), mode='lines', name='E (Frost-obs)',
+            line=dict(color='#185FA5', width=2), customdata=obs_pctl,
             hovertemplate=('<b>E (obs)</b>: %{y:.1f} m·h'
                            '<br>persentil: %{customdata:.0f}<extra></extra>'),
         ), row=1, col=1)
 
     if not fc.empty:
-        fc['pctl'] = [energy_percentile(v) or 0.0 for v in fc['E']]
-        fig.add_trace(go.Scatter(
-            x=fc['time'], y=fc['E'], mode='lines', name='E (Met.no-prognose)',
-            line=dict(color='#185FA5', width=2, dash='dash'), customdata=fc['pctl'],
+        fc_pctl = np.nan_to_num(energy_percentile(fc['E']), nan=0.0)
+        fig.add_trace(go.Scattergl(
+            x=fc['time'], y=_f32(fc['E']), mode='lines', name='E (Met.no-prognose)',
+            line=dict(color='#185FA5', width=2, dash='dash'), customdata=fc_pctl,
             hovertemplate=('<b>E (varsel)</b>: %{y:.1f} m·h'
                            '<br>persentil: %{customdata:.0f}<extra></extra>'),
         ), row=1, col=1)
@@ -624,15 +862,16 @@ def _wind_energy_chart(energy_df,
                       annotation_position='top left', annotation_font_size=11,
                       annotation_font_color='rgba(100,100,100,0.75)', row=row, col=1)
 
-    if not obs.empty:
+    # SE/S-stolpene tegnes bare når det faktisk er SE/S-vind i delen.
+    if not obs.empty and (obs['v_ses'] > 0).any():
         fig.add_trace(go.Bar(
-            x=obs['time'], y=obs['v_ses'], name='SE/S vind (obs)',
+            x=obs['time'], y=_f32(obs['v_ses']), name='SE/S vind (obs)',
             marker_color='rgba(239,159,39,0.55)',
             hovertemplate='%{y:.1f} m/s<extra></extra>',
         ), row=2, col=1)
-    if not fc.empty:
+    if not fc.empty and (fc['v_ses'] > 0).any():
         fig.add_trace(go.Bar(
-            x=fc['time'], y=fc['v_ses'], name='SE/S vind (varsel)',
+            x=fc['time'], y=_f32(fc['v_ses']), name='SE/S vind (varsel)',
             marker_color='rgba(239,159,39,0.25)',
             hovertemplate='%{y:.1f} m/s<extra></extra>',
         ), row=2, col=1)
@@ -647,10 +886,11 @@ def _wind_energy_chart(energy_df,
 # ============================================================================
 
 
-
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
 def _forecast_chart(fetsund_obs_df, forecast_df, travel_hours,
                     history_df=None, history_horizon=24,
-                    title="Temperaturprognose – Fløter'n / Fetsund"):
+                    title="Temperaturprognose – Fløter'n / Fetsund",
+                    now_utc=None):
     """
     Kombinert graf: historiske Fetsund-målinger + prediksjon med usikkerhetsbånd.
 
@@ -679,21 +919,16 @@ def _forecast_chart(fetsund_obs_df, forecast_df, travel_hours,
                       annotation_font_size=10, annotation_font_color="rgba(110,110,110,0.65)")
 
     if forecast_df is not None and not forecast_df.empty:
-        forecast_df = forecast_df.copy()
-        if 'wind_E_forecast' in forecast_df.columns:
-            forecast_df['wind_E_forecast'] = forecast_df['wind_E_forecast'].apply(
-                lambda v: f"{v:.1f} m·h" if pd.notna(v) else "ingen prognose")
-            forecast_df['wind_risk_level'] = forecast_df['wind_risk_level'].fillna('–')
-
         # Filtrer ut rader der KI-båndet har nullbredde (sigma=0 ved t=0),
         # ellers tegner Plotly fill='toself'-polygoner som usynlige linjer.
-        band_df = forecast_df[forecast_df['upper_95'] > forecast_df['lower_95']].copy()
+        band_df = forecast_df[forecast_df['upper_95'] > forecast_df['lower_95']]
         t_fwd = list(band_df['time'])
         t_rev = list(band_df['time'])[::-1]
         if t_fwd:
             fig.add_trace(go.Scatter(
                 x=t_fwd + t_rev,
-                y=list(band_df['upper_95']) + list(band_df['lower_95'])[::-1],
+                y=np.concatenate([_f32(band_df['upper_95']),
+                                  _f32(band_df['lower_95'])[::-1]]),
                 fill='toself', fillcolor='rgba(56,141,228,0.10)',
                 line=dict(color='rgba(0,0,0,0)', width=0),
                 name='95 % område', hoverinfo='skip',
@@ -701,29 +936,38 @@ def _forecast_chart(fetsund_obs_df, forecast_df, travel_hours,
         if t_fwd:
             fig.add_trace(go.Scatter(
                 x=t_fwd + t_rev,
-                y=list(band_df['upper_68']) + list(band_df['lower_68'])[::-1],
+                y=np.concatenate([_f32(band_df['upper_68']),
+                                  _f32(band_df['lower_68'])[::-1]]),
                 fill='toself', fillcolor='rgba(56,141,228,0.22)',
                 line=dict(color='rgba(0,0,0,0)', width=0),
                 name='68 % område', hoverinfo='skip',
             ))
-        hover_cols = ['lower_68', 'upper_68', 'lower_95', 'upper_95']
+        # Hover-dataene bygges i en egen ramme. Tidligere ble vindkolonnene i
+        # en kopi av forecast_df skrevet om til tekst, og fillna('–') gjorde
+        # da hver rad «ikke-tom» - vindrisiko-horisonten havnet på siste rad.
+        hover = forecast_df[['lower_68', 'upper_68', 'lower_95', 'upper_95']]
         hover_template = (
             '<b>Dipp Prediksjon</b>: %{y:.1f} °C<br>'
             '68 %: %{customdata[0]:.1f}–%{customdata[1]:.1f} °C<br>'
             '95 %: %{customdata[2]:.1f}–%{customdata[3]:.1f} °C'
         )
         if 'wind_E_forecast' in forecast_df.columns:
-            hover_cols += ['wind_E_forecast', 'wind_risk_level']
+            e_fc = forecast_df['wind_E_forecast']
+            hover = hover.assign(
+                wind_E_forecast=[f"{v:.1f} m·h" if pd.notna(v) else "ingen prognose"
+                                 for v in e_fc],
+                wind_risk_level=forecast_df['wind_risk_level'].astype(object).fillna('–'),
+            )
             hover_template += (
                 '<br>Vindenergi (varsel): %{customdata[4]} (%{customdata[5]})'
             )
         hover_template += '<extra></extra>'
 
         fig.add_trace(go.Scatter(
-            x=forecast_df['time'], y=forecast_df['predicted'],
+            x=forecast_df['time'], y=_f32(forecast_df['predicted']),
             mode='lines', name='Prediksjon',
             line=dict(color='#185FA5', width=2, dash='dash'),
-            customdata=forecast_df[hover_cols].values,
+            customdata=hover.to_numpy(dtype=object),
             hovertemplate=hover_template,
         ))
 
@@ -738,9 +982,10 @@ def _forecast_chart(fetsund_obs_df, forecast_df, travel_hours,
                     annotation_font_size=10, annotation_font_color='rgba(186,117,23,0.75)',
                 )
 
-        now_ms     = pd.Timestamp.now(tz='UTC').timestamp() * 1000
-        horizon_ms = (pd.Timestamp.now(tz='UTC') +
-                      timedelta(hours=travel_hours)).timestamp() * 1000
+        if now_utc is None:
+            now_utc = pd.Timestamp.now(tz='UTC')
+        now_ms     = now_utc.value / 1e6
+        horizon_ms = now_ms + travel_hours * 3.6e6
         fig.add_vline(x=now_ms, line_dash='dot', line_color='rgba(100,100,100,0.50)',
                       line_width=1, annotation_text='Nå', annotation_position='top left',
                       annotation_font_size=11, annotation_font_color='rgba(100,100,100,0.80)')
@@ -751,7 +996,7 @@ def _forecast_chart(fetsund_obs_df, forecast_df, travel_hours,
 
     if fetsund_obs_df is not None and not fetsund_obs_df.empty:
         fig.add_trace(go.Scatter(
-            x=fetsund_obs_df['time'], y=fetsund_obs_df['value'],
+            x=fetsund_obs_df['time'], y=_f32(fetsund_obs_df['value']),
             mode='lines', name='Observert (Fetsund)',
             line=dict(color='#185FA5', width=2),
             hovertemplate='<b>Observert</b>: %{y:.1f} °C<extra></extra>',
@@ -769,20 +1014,14 @@ def _forecast_chart(fetsund_obs_df, forecast_df, travel_hours,
 
     # ── Tidligere prediksjoner (fasit-linjen) ────────────────────────────────
     if history_df is not None and not history_df.empty:
-        hd = history_df.copy()
-        hd['time'] = pd.to_datetime(hd['time'])
-        if hd['time'].dt.tz is None:
-            hd['time'] = hd['time'].dt.tz_localize('UTC')
+        hd = history_df          # tz-aware UTC fra prediction_history_series()
         # Begrens til samme tidsrom som observasjonene, slik at grafen ikke
         # zoomer ut til hele loggens levetid.
         if fetsund_obs_df is not None and not fetsund_obs_df.empty:
-            _t0 = pd.to_datetime(fetsund_obs_df['time']).min()
-            if _t0.tzinfo is None:
-                _t0 = _t0.tz_localize('UTC')
-            hd = hd[hd['time'] >= _t0]
+            hd = hd[hd['time'] >= fetsund_obs_df['time'].min()]
         if not hd.empty:
             fig.add_trace(go.Scatter(
-                x=hd['time'], y=hd['predicted'],
+                x=hd['time'], y=_f32(hd['predicted']),
                 mode='lines+markers',
                 name=f'Predikert {history_horizon} t i forveien',
                 line=dict(color='#BA7517', width=1.8, dash='dash'),
@@ -1022,8 +1261,16 @@ def page_prediksjon():
         "ved typisk augustvannføring."
     )
 
+    # Ett «nå» for hele siden: alle aldre, nedtellinger og horisonter regnes
+    # mot samme tidspunkt i stedet for en ny Timestamp.now() per bruk.
+    now_utc    = pd.Timestamp.now(tz='UTC')
+    # Modellene får et nå avrundet ned til cache-ttl-en (10 min): samme
+    # argument gir samme cachenøkkel, så reruns innenfor vinduet blir oppslag
+    # i stedet for nye kjøringer.
+    model_now  = now_utc.floor('10min')
+    chart_now  = now_utc.floor('min')
     event_date = calculate_event_date(EVENT_YEAR)
-    days_until = (event_date - pd.Timestamp.now(tz='UTC')).days
+    days_until = (event_date - now_utc).days
     oslo_dt    = event_date.tz_convert('Europe/Oslo')
 
     c1, c2, c3, c4 = st.columns(4)
@@ -1031,42 +1278,52 @@ def page_prediksjon():
     c2.metric("Dager igjen", str(max(0, days_until)))
 
     with st.spinner("Henter data…"):
+        # Alle hentingene er uavhengige av hverandre og går samtidig; ventetiden
+        # blir den tregeste av dem i stedet for summen.
+        #
         # ÉN henting av Vorma-temperatur med det lengste vinduet som trengs.
         # Seiche-deteksjonen krever 20 døgn (bunnpunkt inntil 12 d tilbake +
         # 7 d baseline før det); prognosen bruker de siste 7 døgnene av samme
         # serie. Tidligere ble stasjonen hentet to ganger (168 t og 336 t).
-        vorma_history = fetch_nve_data(STATION_SVANEFOSS, 1003,
-                                       hours_back=SEICHE_HISTORY_HOURS)
+        _data = _fetch_all({
+            'vorma_history':  lambda: fetch_nve_data(STATION_SVANEFOSS, 1003,
+                                                     hours_back=SEICHE_HISTORY_HOURS),
+            # 7-døgnsseriene hentes samlet, én forespørsel per parameter.
+            # Glomma-temperatur: nødvendig for blandingsskranken (v1.11.4)
+            'temp': lambda: fetch_nve_batch((STATION_FETSUND, STATION_FUNNEFOSS_TEMP), 1003),
+            # Glomma-vannføring: nødvendig for dynamisk uttynning κ = Q_V/(Q_V+Q_G)
+            'q':    lambda: fetch_nve_batch((STATION_ERTESEKKEN_Q, STATION_FUNNEFOSS_Q), 1001),
+            'frost_vind':     lambda: fetch_frost_wind(hours_back=168),
+            'weather_mjosa':  lambda: fetch_weather_forecast(MJOSA_LAT, MJOSA_LON),
+        })
+        vorma_history  = _data['vorma_history']
+        fetsund_temp   = _data['temp'][STATION_FETSUND]
+        funnefoss_temp = _data['temp'][STATION_FUNNEFOSS_TEMP]
+        ertesekken_q   = _data['q'][STATION_ERTESEKKEN_Q]
+        funnefoss_q    = _data['q'][STATION_FUNNEFOSS_Q]
+        frost_vind     = _data['frost_vind']
+        weather_mjosa  = _data['weather_mjosa']
+
         # v1.11.4: den gamle fallbacken hentet Funnefoss (2.410.0) som erstatning
         # for Svanefoss. Funnefoss ligger i GLOMMA, ikke i Vorma, og er 4-5 °C
         # varmere uten oppvellingssignal. Modellen ville da rapportert «ingen
         # kaldpuls» stikk i strid med virkeligheten. Bedre å feile åpenlyst.
-        primary_df = vorma_history.copy()
+        primary_df = vorma_history
         if not primary_df.empty:
-            _cut = pd.to_datetime(primary_df['time']).max() - pd.Timedelta(hours=168)
-            primary_df = primary_df[pd.to_datetime(primary_df['time']) >= _cut] \
-                             .reset_index(drop=True)
-
-        fetsund_temp  = fetch_nve_data(STATION_FETSUND,      1003, hours_back=168)
-        ertesekken_q  = fetch_nve_data(STATION_ERTESEKKEN_Q, 1001, hours_back=168)
-        # Glomma-vannføring: nødvendig for dynamisk uttynning κ = Q_V/(Q_V+Q_G)
-        funnefoss_q   = fetch_nve_data(STATION_FUNNEFOSS_Q,  1001, hours_back=168)
-        # Glomma-temperatur: nødvendig for blandingsskranken (v1.11.4)
-        funnefoss_temp = fetch_nve_data(STATION_FUNNEFOSS_TEMP, 1003, hours_back=168)
-        frost_vind    = fetch_frost_wind(hours_back=168)
-        weather_mjosa = fetch_weather_forecast(MJOSA_LAT, MJOSA_LON)
-        if not weather_mjosa.empty:
-            weather_mjosa = add_southerly_component(weather_mjosa)
-        seiche = detect_seiche_risk(vorma_history)
+            _cut = primary_df['time'].max() - pd.Timedelta(hours=168)
+            primary_df = primary_df[primary_df['time'] >= _cut].reset_index(drop=True)
+
+        # 48 t-nøkkeltallene for vinden regnes én gang og gjenbrukes nedover.
+        wind_stats = southerly_wind_stats(weather_mjosa)
+        seiche = detect_seiche_risk(vorma_history, now=model_now)
 
     if primary_df.empty:
         st.error("Ingen Vorma-data tilgjengelig. Sjekk NVE HydAPI.")
         return
 
-    _last_t = pd.to_datetime(primary_df['time'].max())
-    if _last_t.tzinfo is None:
-        _last_t = _last_t.tz_localize('UTC')
-    data_age_hours = (pd.Timestamp.now(tz='UTC') - _last_t).total_seconds() / 3600
+    # fetch_nve_data leverer tz-aware UTC, så ingen lokalisering her.
+    _last_t = primary_df['time'].iloc[-1]
+    data_age_hours = (now_utc.value - _last_t.value) / 3.6e12
 
     c3.metric("Siste Vorma-data",
               _last_t.tz_convert('Europe/Oslo').strftime('%d.%m %H:%M'))
@@ -1078,9 +1335,12 @@ def page_prediksjon():
     st.header("Nåværende status")
     c1, c2, c3, c4 = st.columns(4)
 
-    latest_val = primary_df.iloc[-1]['value']
-    delta_24   = (f"{latest_val - primary_df.iloc[-24]['value']:+.1f} °C (24t)"
-                  if len(primary_df) >= 24 else "–")
+    # Rett på verdi-arrayen: iloc[-1]['value'] bygger en hel rad-Series (med
+    # object-dtype over blandede kolonner) bare for å lese ett tall.
+    _vorma_v   = primary_df['value'].to_numpy()
+    latest_val = float(_vorma_v[-1])
+    change_24  = latest_val - float(_vorma_v[-24]) if len(_vorma_v) >= 24 else None
+    delta_24   = f"{change_24:+.1f} °C (24t)" if change_24 is not None else "–"
     c1.metric("Vorma nå", f"{latest_val:.1f} °C", delta=delta_24)
 
     drop = detect_temperature_drop(primary_df, threshold_C=2.0, window_hours=6)
@@ -1091,9 +1351,11 @@ def page_prediksjon():
         c2.metric("Temperaturfall (6t)", "Ingen", delta="✓ Stabilt")
 
     if not weather_mjosa.empty:
-        cw = weather_mjosa.iloc[0]
-        c3.metric("Vind (Mjøsa)", f"{cw['wind_speed']:.1f} m/s",
-                  delta=f"{cw['wind_direction']:.0f}° ({wind_rose_label(cw['wind_direction'])})")
+        cw_speed = weather_mjosa['wind_speed'].iat[0]
+        cw_dir   = weather_mjosa['wind_direction'].iat[0]
+        c3.metric("Vind (Mjøsa)", f"{cw_speed:.1f} m/s",
+                  delta=(f"{cw_dir:.0f}° ({wind_rose_label(cw_dir)})"
+                         if np.isfinite(cw_dir) else None))
     else:
         c3.metric("Vind (Mjøsa)", "N/A")
 
@@ -1122,7 +1384,7 @@ def page_prediksjon():
               "talt identisk med den empiriske episode-κ = 0,63 fra 35 kalde "
               "episoder, som bekrefter tolkningen."),
     )
-    _qg_txt = (f"{funnefoss_q.iloc[-1]['value']:.0f} m³/s"
+    _qg_txt = (f"{funnefoss_q['value'].iat[-1]:.0f} m³/s"
                if not funnefoss_q.empty else "N/A")
     k2.metric("Vannføring Vorma (Ertesekken)", f"{q_val:.0f} m³/s")
     k3.metric("Vannføring Glomma (Funnefoss)", _qg_txt,
@@ -1141,8 +1403,7 @@ def page_prediksjon():
     # I så fall er en ny (tredje) kalddipp i samme periode lite sannsynlig, og
     # varselet nedgraderes til en info om at oppgangen forventes å forplante
     # seg nedstrøms til Fløter'n/Fetsund.
-    vorma_rising = (len(primary_df) >= 24 and
-                     (latest_val - primary_df.iloc[-24]['value']) > 0.2)
+    vorma_rising = change_24 is not None and change_24 > 0.2
 
     if seiche['active'] and vorma_rising:
         ep_date_oslo = seiche['episode_date'].tz_convert(
@@ -1175,11 +1436,12 @@ def page_prediksjon():
 
 
     # ── Bygg prognose tidlig så den er tilgjengelig i hele seksjonen ─────────
-    energy_df   = build_wind_energy_series(frost_vind, weather_mjosa)
+    energy_df   = build_wind_energy_series(frost_vind, weather_mjosa, now=model_now)
     forecast_df = build_fetsund_forecast(primary_df, fetsund_temp, ertesekken_q,
                                          glomma_q_df=funnefoss_q,
                                          glomma_temp_df=funnefoss_temp,
-                                         energy_df=energy_df)
+                                         energy_df=energy_df,
+                                         now=model_now)
     _mode = forecast_df['mode'].iloc[0] if not forecast_df.empty else None
     if _mode == 'level' and FORECAST_MODE == 'increment':
         st.info(
@@ -1210,7 +1472,7 @@ def page_prediksjon():
         "reell fremoverskuende informasjon (AUC = 0,77, 95 % KI 0,72–0,88, for ΔT < −3 °C)."
     )
 
-    _now_oslo = pd.Timestamp.now(tz='UTC').tz_convert('Europe/Oslo')
+    _now_oslo = now_utc.tz_convert('Europe/Oslo')
 
     def _dato_label(h):
         """Dato OG klokkeslett prediksjonen gjelder for (norsk tid).
@@ -1240,21 +1502,18 @@ def page_prediksjon():
         )
     elif not forecast_df.empty:
         fcols = st.columns(4)
+        fc_t = forecast_df['time']     # tz-aware UTC fra build_fetsund_forecast
         for i, (label, h) in enumerate(HORIZONS):
             # Finn raden nærmest h timer frem i tid
-            now_utc = pd.Timestamp.now(tz='UTC')
             target_t = now_utc + pd.Timedelta(hours=h)
-            fc_t = pd.to_datetime(forecast_df['time'])
-            if fc_t.dt.tz is None:
-                fc_t = fc_t.dt.tz_localize('UTC')
-            idx = (fc_t - target_t).abs().idxmin()
-            row = forecast_df.loc[idx]
+            idx = nearest_time_index(fc_t, target_t)
+            row = forecast_df.iloc[idx]
 
             # Modellen er punktvis i 3-timers steg, så raden som velges kan
             # ligge inntil 1,5 t fra det nominelle tidspunktet. Vi merker
             # kolonnen med tidspunktet raden FAKTISK gjelder for – ellers
             # lover etiketten en presisjon prognosen ikke har.
-            _row_t = pd.Timestamp(fc_t.loc[idx]).tz_convert('Europe/Oslo')
+            _row_t = fc_t.iloc[idx].tz_convert('Europe/Oslo')
             _valid_txt = _row_t.strftime('%a %d.%m kl. %H:%M')
             if h > travel_h_now:
                 label = _valid_txt
@@ -1338,7 +1597,8 @@ def page_prediksjon():
             hist_df = _core.prediction_history_series(pred_log, hist_h)
 
         fig_fc = _forecast_chart(fetsund_temp, forecast_df, travel_h_now,
-                                 history_df=hist_df, history_horizon=hist_h)
+                                 history_df=hist_df, history_horizon=hist_h,
+                                 now_utc=chart_now)
         st.plotly_chart(fig_fc, use_container_width=True, config={"responsive": True})
         if pred_log.empty:
             st.caption(
@@ -1391,11 +1651,13 @@ def page_prediksjon():
             # visningen "0.0 m·h ⚠️ Kan overskride terskel!".
             if not fc_e.empty:
                 peak_i  = fc_e['E'].idxmax()
-                fc_E    = float(fc_e.loc[peak_i, 'E'])
-                fc_when = pd.to_datetime(fc_e.loc[peak_i, 'time'])
+                fc_E    = float(fc_e.at[peak_i, 'E'])
+                # Tidskolonnen er allerede tz-aware UTC (build_wind_energy_series),
+                # så verdien er en ferdig Timestamp - ingen ny parsing.
+                fc_when = fc_e.at[peak_i, 'time']
                 fc_Ehi  = float(fc_e['E_upper'].max())
                 fc_lbl  = fc_when.tz_convert('Europe/Oslo').strftime('%a %d.%m kl. %H')
-                days_to = (fc_when - pd.Timestamp.now(tz='UTC')).total_seconds() / 86400
+                days_to = (fc_when.value - now_utc.value) / 8.64e13
             else:
                 fc_E = fc_Ehi = cur_E
                 fc_lbl, days_to = None, None
@@ -1441,7 +1703,7 @@ def page_prediksjon():
             c3.metric("Høyeste prognosert E", "N/A")
 
         if not weather_mjosa.empty:
-            avg_ses = weather_mjosa.head(48)['southerly_wind'].mean()
+            avg_ses = wind_stats['avg_southerly']
             if avg_ses >= CRITICAL_WIND_SPEED:
                 c4.metric("SE/S-vind (48t)", f"{avg_ses:.1f} m/s",
                           delta="⚠️ Oppvellings-risiko!", delta_color="inverse")
@@ -1451,7 +1713,7 @@ def page_prediksjon():
         wind_tabs = st.tabs(["Kumulativ oppvellingsrisiko", "Vindretning og -hastighet"])
         with wind_tabs[0]:
             if not energy_df.empty:
-                fig_e = _wind_energy_chart(energy_df)
+                fig_e = _wind_energy_chart(energy_df, now_utc=chart_now)
                 if fig_e:
                     st.plotly_chart(fig_e, use_container_width=True, config={"responsive": True})
                 st.caption(
@@ -1519,6 +1781,74 @@ def page_prediksjon():
 # PAGE: DATA & VARSEL
 # ============================================================================
 
+@st.fragment
+def _transport_time_section(er_q):
+    """
+    Transporttid og drahjelp med glidebryter for vannføringen. Kjøres som et
+    fragment: å dra i glidebryteren kjører bare denne blokken på nytt, ikke
+    hele siden med elleve hentinger og alle grafene.
+    """
+    st.subheader("Transporttid fra Svanefoss/Ertesekken")
+    q_now, _ = safe_discharge(er_q, FALLBACK_DISCHARGE)
+    q_now = min(max(q_now, 100), 1200)
+    q_val = st.slider("Vannføring ved Ertesekken (m³/s)",
+                      min_value=100, max_value=1200,
+                      value=int(q_now), step=10)
+    tf_calc = round(TRANSPORT_COEFF_FLOTERN / q_val, 1)
+    t_calc  = round(TRANSPORT_COEFF / q_val, 1)
+    st.info(
+        f"**Start Fløter'n: t = 7670 / {q_val} = {tf_calc} timer** (35,5 km)  \n"
+        f"**Fetsund:  t = 9700 / {q_val} = {t_calc} timer** (45,0 km)  \n"
+        f"*Fløter'n: {t_calc - tf_calc:.1f} timer tidligere enn Fetsund*"
+    )
+
+    # ── Drahjelp for svømmeren på løpsstrekket ───────────────────────────
+    # Oppmålt løypelengde (11,0 km langs midtstrømmen) delt på differansen i
+    # transporttid gir strømhastigheten på løpsstrekket.
+    st.subheader("Drahjelp for svømmeren – Fløter'n → Fetsund")
+
+    v_cur     = reach_current_speed(q_val)
+    drift_h   = (TRANSPORT_COEFF - TRANSPORT_COEFF_FLOTERN) / q_val
+
+    s1, s2, s3 = st.columns(3)
+    s1.metric(
+        "Strømhastighet, m/s", f"{v_cur:.2f} m/s",
+        help=(f"v = Q · 11 000 m / (Δk · 3600 s) der Δk = 9700 − 7670 = "
+              f"2030, altså v ≈ Q / 664. Løypelengden er oppmålt langs "
+              f"midtstrømmen."),
+    )
+    s2.metric("Strømhastighet, km/t", f"{v_cur * 3.6:.2f} km/t")
+    s3.metric(
+        f"Ren drift {REACH_FLOTERN_FETSUND_KM:.0f} km", f"{drift_h:.1f} t",
+        help="Tiden strekket tar uten å svømme i det hele tatt – "
+             "identisk med differansen i transporttid over.",
+    )
+
+    swim_tbl = _swim_assist_table(q_val)
+    if swim_tbl is not None:
+        st.dataframe(swim_tbl, hide_index=True, use_container_width=True)
+
+    st.caption(
+        f"**Slik leses tallet:** ved Q = {q_val} m³/s får svømmeren "
+        f"**{v_cur:.2f} m/s** i drahjelp over løpsstrekket – strømmen gjør "
+        "en jevn del av jobben uansett hvor fort du selv svømmer, og betyr "
+        "relativt sett mer jo saktere du svømmer.  \n"
+        f"**Løypelengde:** 11,0 km oppmålt langs midtstrømmen, fra "
+        f"startpunktet ({FLOTERN_START_LAT:.4f}°N, {FLOTERN_START_LON:.4f}°E, "
+        "litt sørvest for Bingsfossen) til Fetsund lenser. Den faktiske "
+        "distansen varierer med hvilken linje man svømmer; holder man seg "
+        "utenfor hovedstrømmen blir strekket kortere, men drahjelpen "
+        "tilsvarende svakere.  \n"
+        "**Forbehold:** hastigheten er en *strekningsmiddelverdi* for "
+        "vannmassen, avledet av transportkoeffisientene som er kalibrert på "
+        "kaldpulsens framdrift – ikke på overflatestrømmen. Midt i "
+        "hovedstrømmen ligger overflaten typisk 10–25 % høyere, mens farten "
+        "faller i de brede, stilleflytende partiene mot Nordre Øyeren. Bruk "
+        "tallet som et anslag for strekket som helhet, ikke som en lovnad om "
+        "drahjelp på et gitt punkt."
+    )
+
+
 def page_data_varsel():
     st.title("Observasjoner og Værvarsler")
     st.markdown(
@@ -1534,17 +1864,30 @@ def page_data_varsel():
     ])
 
     with st.spinner("Henter observasjoner…"):
-        sv_temp    = fetch_nve_data(STATION_SVANEFOSS,      1003, hours_back=168)
-        fn_temp    = fetch_nve_data(STATION_FUNNEFOSS_TEMP, 1003, hours_back=168)
-        bl_temp    = fetch_nve_data(STATION_BLAKER,         1003, hours_back=168)
-        fe_temp    = fetch_nve_data(STATION_FETSUND,        1003, hours_back=168)
-        er_q       = fetch_nve_data(STATION_ERTESEKKEN_Q,   1001, hours_back=168)
-        bl_q       = fetch_nve_data(STATION_BLAKER,         1001, hours_back=168)
-        fn_q       = fetch_nve_data(STATION_FUNNEFOSS_Q,    1001, hours_back=168)
-        frost_vind = fetch_frost_wind(hours_back=168)
-        fc_mjosa   = fetch_weather_forecast(MJOSA_LAT,   MJOSA_LON)
-        fc_start   = fetch_weather_forecast(FLOTERN_START_LAT, FLOTERN_START_LON)
-        fc_fetsund = fetch_weather_forecast(FETSUND_LAT, FETSUND_LON)
+        # Seks uavhengige hentinger - samtidig, over den delte Session-poolen
+        # i kjernen, så kald cache koster den tregeste av dem, ikke summen.
+        # De sju NVE-seriene går som to samlede forespørsler (én per parameter).
+        _data = _fetch_all({
+            'temp':       lambda: fetch_nve_batch((STATION_SVANEFOSS, STATION_FUNNEFOSS_TEMP,
+                                                   STATION_BLAKER, STATION_FETSUND), 1003),
+            'q':          lambda: fetch_nve_batch((STATION_ERTESEKKEN_Q, STATION_BLAKER,
+                                                   STATION_FUNNEFOSS_Q), 1001),
+            'frost_vind': lambda: fetch_frost_wind(hours_back=168),
+            'fc_mjosa':   lambda: fetch_weather_forecast(MJOSA_LAT,   MJOSA_LON),
+            'fc_start':   lambda: fetch_weather_forecast(FLOTERN_START_LAT, FLOTERN_START_LON),
+            'fc_fetsund': lambda: fetch_weather_forecast(FETSUND_LAT, FETSUND_LON),
+        })
+        sv_temp    = _data['temp'][STATION_SVANEFOSS]
+        fn_temp    = _data['temp'][STATION_FUNNEFOSS_TEMP]
+        bl_temp    = _data['temp'][STATION_BLAKER]
+        fe_temp    = _data['temp'][STATION_FETSUND]
+        er_q       = _data['q'][STATION_ERTESEKKEN_Q]
+        bl_q       = _data['q'][STATION_BLAKER]
+        fn_q       = _data['q'][STATION_FUNNEFOSS_Q]
+        frost_vind = _data['frost_vind']
+        fc_mjosa   = _data['fc_mjosa']
+        fc_start   = _data['fc_start']
+        fc_fetsund = _data['fc_fetsund']
 
     # ── TAB 1: Vanntemperatur ─────────────────────────────────────────────────
     with tabs[0]:
@@ -1554,7 +1897,7 @@ def page_data_varsel():
         c1, c2, c3, c4 = st.columns(4)
         def _latest(df, label, col):
             if df.empty: col.metric(label, "N/A")
-            else:        col.metric(label, f"{df.iloc[-1]['value']:.1f} °C")
+            else:        col.metric(label, f"{df['value'].iat[-1]:.1f} °C")
         _latest(sv_temp, "Svanefoss (Vorma)",  c1)
         _latest(fn_temp, "Funnefoss (Glomma)", c2)
         _latest(bl_temp, "Blaker (Glomma)",    c3)
@@ -1588,7 +1931,7 @@ def page_data_varsel():
             if df.empty:
                 col.metric(label, "N/A")
             else:
-                v = df.iloc[-1]['value']
+                v = df['value'].iat[-1]
                 tf = round(TRANSPORT_COEFF_FLOTERN / v, 1) if v > 0 else None
                 col.metric(label, f"{v:.0f} m³/s",
                            help=f"Fløter'n ≈ {tf} t" if tf else None)
@@ -1611,84 +1954,7 @@ def page_data_varsel():
             "median (Q_Ertesekken + Q_Funnefoss) / Q_Blaker = 1,03 over 2015–2025."
         )
 
-        st.subheader("Transporttid fra Svanefoss/Ertesekken")
-        q_now, _ = safe_discharge(er_q, FALLBACK_DISCHARGE)
-        q_now = min(max(q_now, 100), 1200)
-        q_val = st.slider("Vannføring ved Ertesekken (m³/s)",
-                          min_value=100, max_value=1200,
-                          value=int(q_now), step=10)
-        tf_calc = round(TRANSPORT_COEFF_FLOTERN / q_val, 1)
-        t_calc  = round(TRANSPORT_COEFF / q_val, 1)
-        st.info(
-            f"**Start Fløter'n: t = 7670 / {q_val} = {tf_calc} timer** (35,5 km)  \n"
-            f"**Fetsund:  t = 9700 / {q_val} = {t_calc} timer** (45,0 km)  \n"
-            f"*Fløter'n: {t_calc - tf_calc:.1f} timer tidligere enn Fetsund*"
-        )
-
-        # ── Drahjelp for svømmeren på løpsstrekket ───────────────────────────
-        # Oppmålt løypelengde (11,0 km langs midtstrømmen) delt på differansen i
-        # transporttid gir strømhastigheten på løpsstrekket.
-        st.subheader("Drahjelp for svømmeren – Fløter'n → Fetsund")
-
-        v_cur     = reach_current_speed(q_val)
-        drift_h   = (TRANSPORT_COEFF - TRANSPORT_COEFF_FLOTERN) / q_val
-
-        s1, s2, s3 = st.columns(3)
-        s1.metric(
-            "Strømhastighet, m/s", f"{v_cur:.2f} m/s",
-            help=(f"v = Q · 11 000 m / (Δk · 3600 s) der Δk = 9700 − 7670 = "
-                  f"2030, altså v ≈ Q / 664. Løypelengden er oppmålt langs "
-                  f"midtstrømmen."),
-        )
-        s2.metric("Strømhastighet, km/t", f"{v_cur * 3.6:.2f} km/t")
-        s3.metric(
-            f"Ren drift {REACH_FLOTERN_FETSUND_KM:.0f} km", f"{drift_h:.1f} t",
-            help="Tiden strekket tar uten å svømme i det hele tatt – "
-                 "identisk med differansen i transporttid over.",
-        )
-
-        def _hms(sec):
-            sec = int(round(sec))
-            return f"{sec // 3600}:{(sec % 3600) // 60:02d}:{sec % 60:02d}"
-
-        _PACES = [(80, "1:20"), (100, "1:40"), (120, "2:00"),
-                  (150, "2:30"), (180, "3:00")]
-        _rows = []
-        for _p_s, _p_lbl in _PACES:
-            a = swim_assist(q_val, _p_s)
-            if a is None:
-                continue
-            _rows.append({
-                "Egenfart (min/100 m)":  _p_lbl,
-                "Egenfart (m/s)":        f"{a['v_swim']:.2f}",
-                "Med strøm (m/s)":       f"{a['v_total']:.2f}",
-                "Tid uten strøm":        _hms(a['t_still']),
-                "Tid med strøm":         _hms(a['t_current']),
-                "Spart":                 f"{_hms(a['gain'])}  ({a['gain_pct']:.0f} %)",
-            })
-        if _rows:
-            st.dataframe(pd.DataFrame(_rows), hide_index=True,
-                         use_container_width=True)
-
-        st.caption(
-            f"**Slik leses tallet:** ved Q = {q_val} m³/s får svømmeren "
-            f"**{v_cur:.2f} m/s** i drahjelp over løpsstrekket – strømmen gjør "
-            "en jevn del av jobben uansett hvor fort du selv svømmer, og betyr "
-            "relativt sett mer jo saktere du svømmer.  \n"
-            f"**Løypelengde:** 11,0 km oppmålt langs midtstrømmen, fra "
-            f"startpunktet ({FLOTERN_START_LAT:.4f}°N, {FLOTERN_START_LON:.4f}°E, "
-            "litt sørvest for Bingsfossen) til Fetsund lenser. Den faktiske "
-            "distansen varierer med hvilken linje man svømmer; holder man seg "
-            "utenfor hovedstrømmen blir strekket kortere, men drahjelpen "
-            "tilsvarende svakere.  \n"
-            "**Forbehold:** hastigheten er en *strekningsmiddelverdi* for "
-            "vannmassen, avledet av transportkoeffisientene som er kalibrert på "
-            "kaldpulsens framdrift – ikke på overflatestrømmen. Midt i "
-            "hovedstrømmen ligger overflaten typisk 10–25 % høyere, mens farten "
-            "faller i de brede, stilleflytende partiene mot Nordre Øyeren. Bruk "
-            "tallet som et anslag for strekket som helhet, ikke som en lovnad om "
-            "drahjelp på et gitt punkt."
-        )
+        _transport_time_section(er_q)
 
     # ── TAB 3: Vind ved Mjøsa ─────────────────────────────────────────────────
     with tabs[2]:
@@ -1699,13 +1965,13 @@ def page_data_varsel():
             st.warning("Vindmålinger fra Frost API ikke tilgjengelig.")
         else:
             if 'wind_direction' in frost_vind.columns:
-                is_ses    = ((frost_vind['wind_direction'] >= WIND_SECTOR_MIN) &
-                             (frost_vind['wind_direction'] <= WIND_SECTOR_MAX))
-                avg_ses   = frost_vind.loc[is_ses, 'wind_speed'].mean() if is_ses.any() else 0.0
+                is_ses    = _ses_mask(frost_vind)
+                ws        = frost_vind['wind_speed'].to_numpy(dtype=np.float64, na_value=np.nan)
+                avg_ses   = float(np.nanmean(ws[is_ses])) if is_ses.any() else 0.0
                 ses_hours = int(is_ses.sum())
 
                 c1, c2, c3, c4 = st.columns(4)
-                c1.metric("Vindhastighet nå",    f"{frost_vind.iloc[-1]['wind_speed']:.1f} m/s")
+                c1.metric("Vindhastighet nå",    f"{frost_vind['wind_speed'].iat[-1]:.1f} m/s")
                 c2.metric("Gj.snitt total (7d)", f"{frost_vind['wind_speed'].mean():.1f} m/s")
                 c3.metric("Timer SE/S-vind",      f"{ses_hours} t")
                 if avg_ses >= CRITICAL_WIND_SPEED:
@@ -1740,11 +2006,10 @@ def page_data_varsel():
             if fc_mjosa.empty:
                 st.warning("Varsel ikke tilgjengelig")
             else:
-                fc_mjosa_s = add_southerly_component(fc_mjosa.copy())
-                tbl = _daily_forecast_table(fc_mjosa_s)
+                tbl = _daily_forecast_table(fc_mjosa)
                 if tbl is not None:
                     st.dataframe(tbl, use_container_width=True, hide_index=True)
-                chart = _wind_forecast_chart(fc_mjosa_s, "Vindvarsel – Mjøsa")
+                chart = _wind_forecast_chart(fc_mjosa, "Vindvarsel – Mjøsa")
                 if chart:
                     st.plotly_chart(chart, use_container_width=True, config={"responsive": True})
 
@@ -1895,17 +2160,17 @@ def page_treffsikkerhet():
     if len(summary) > 0:
         fig_mae = go.Figure()
         fig_mae.add_trace(go.Bar(
-            x=[f"+{h} t" for h in summary['horizon_h']], y=summary['mae'],
+            x=[f"+{h} t" for h in summary['horizon_h']], y=_f32(summary['mae']),
             name='MAE', marker_color='#185FA5',
             hovertemplate='<b>MAE</b>: %{y:.2f} °C<extra></extra>',
         ))
         fig_mae.add_trace(go.Bar(
-            x=[f"+{h} t" for h in summary['horizon_h']], y=summary['sigma_implied'],
+            x=[f"+{h} t" for h in summary['horizon_h']], y=_f32(summary['sigma_implied']),
             name='σ faktisk', marker_color='rgba(186,117,23,0.75)',
             hovertemplate='<b>σ faktisk</b>: %{y:.2f} °C<extra></extra>',
         ))
         fig_mae.add_trace(go.Scatter(
-            x=[f"+{h} t" for h in summary['horizon_h']], y=summary['sigma_mean'],
+            x=[f"+{h} t" for h in summary['horizon_h']], y=_f32(summary['sigma_mean']),
             mode='lines+markers', name='σ oppgitt av modellen',
             line=dict(color='#6B0000', width=2, dash='dot'),
             hovertemplate='<b>σ oppgitt</b>: %{y:.2f} °C<extra></extra>',
@@ -1920,6 +2185,15 @@ def page_treffsikkerhet():
         st.plotly_chart(fig_mae, use_container_width=True,
                         config={"responsive": True})
 
+    _accuracy_by_horizon(ev)
+
+
+@st.fragment
+def _accuracy_by_horizon(ev):
+    """
+    «Predikert mot observert» for valgt horisont. Fragment, så et bytte i
+    nedtrekkslisten ikke henter loggen og bygger oppsummeringen på nytt.
+    """
     # ── Predikert mot observert ──────────────────────────────────────────────
     st.divider()
     st.header("Predikert mot observert")
@@ -1939,20 +2213,21 @@ def page_treffsikkerhet():
         band = sub.dropna(subset=['lower68', 'upper68'])
         fig_ts.add_trace(go.Scatter(
             x=list(band['valid_time']) + list(band['valid_time'])[::-1],
-            y=list(band['upper68']) + list(band['lower68'])[::-1],
+            y=np.concatenate([_f32(band['upper68']),
+                              _f32(band['lower68'])[::-1]]),
             fill='toself', fillcolor='rgba(186,117,23,0.16)',
             line=dict(color='rgba(0,0,0,0)'), name='68 % område',
             hoverinfo='skip',
         ))
     fig_ts.add_trace(go.Scatter(
-        x=sub['valid_time'], y=sub['predicted'], mode='lines+markers',
+        x=sub['valid_time'], y=_f32(sub['predicted']), mode='lines+markers',
         name=f'Predikert {sel_h} t i forveien',
         line=dict(color='#BA7517', width=1.8, dash='dash'),
         marker=dict(size=5),
         hovertemplate='<b>Predikert</b>: %{y:.1f} °C<extra></extra>',
     ))
     fig_ts.add_trace(go.Scatter(
-        x=sub['valid_time'], y=sub['observed'], mode='lines',
+        x=sub['valid_time'], y=_f32(sub['observed']), mode='lines',
         name='Observert (Fetsund)', line=dict(color='#185FA5', width=2.2),
         hovertemplate='<b>Observert</b>: %{y:.1f} °C<extra></extra>',
     ))
@@ -1969,7 +2244,7 @@ def page_treffsikkerhet():
     # ── Feilfordeling ────────────────────────────────────────────────────────
     fig_err = go.Figure()
     fig_err.add_trace(go.Scatter(
-        x=sub['valid_time'], y=sub['error'], mode='markers',
+        x=sub['valid_time'], y=_f32(sub['error']), mode='markers',
         marker=dict(size=7, color=sub['error'], colorscale='RdBu',
                     cmid=0, cmin=-3, cmax=3, showscale=False),
         name='Avvik', hovertemplate='<b>Avvik</b>: %{y:+.2f} °C<extra></extra>',
@@ -1990,7 +2265,7 @@ def page_treffsikkerhet():
     # ── Treff fordelt på vindrisikonivå ──────────────────────────────────────
     if 'windrisk' in sub.columns and sub['windrisk'].notna().any():
         grp = (sub.dropna(subset=['windrisk'])
-                  .groupby('windrisk')['abs_error']
+                  .groupby('windrisk', observed=True)['abs_error']
                   .agg(['count', 'mean']).reset_index())
         grp = grp[grp['count'] >= 3]
         if not grp.empty:
@@ -2008,7 +2283,7 @@ def page_treffsikkerhet():
             )
 
     with st.expander("Alle etterprøvde prediksjoner (rådata)"):
-        raw = ev.copy().sort_values(['valid_time', 'horizon_h'], ascending=[False, True])
+        raw = ev.sort_values(['valid_time', 'horizon_h'], ascending=[False, True])
         raw['logged_at']  = raw['logged_at'].dt.tz_convert('Europe/Oslo').dt.strftime('%d.%m %H:%M')
         raw['valid_time'] = raw['valid_time'].dt.tz_convert('Europe/Oslo').dt.strftime('%d.%m %H:%M')
         st.dataframe(
@@ -2038,19 +2313,10 @@ def main():
         unsafe_allow_html=True,
     )
     with st.sidebar:
-        # Logoen leses fra disk. Mangler filen (eller er repoet sjekket ut uten
-        # den), skal det IKKE ta ned hele appen - da vises bare en tekstlenke.
-        try:
-            _logo_b64 = __import__('base64').b64encode(
-                open('Samensatt_logo_GlommDyppen.jpg', 'rb').read()).decode()
-            st.markdown(
-                '<a href="https://glommadyppen.no" target="_blank">'
-                + f'<img src="data:image/jpeg;base64,{_logo_b64}" '
-                  'style="width:100%;cursor:pointer;">'
-                + '</a>',
-                unsafe_allow_html=True
-            )
-        except OSError:
+        logo_html = _logo_html()
+        if logo_html:
+            st.markdown(logo_html, unsafe_allow_html=True)
+        else:
             st.markdown("### [GlommaDyppen](https://glommadyppen.no)")
         st.markdown("---")
         page = st.radio(
@@ -2060,7 +2326,7 @@ def main():
             label_visibility="collapsed",
         )
         st.markdown("---")
-        st.caption(f"App 1.11.4 · kjerne {getattr(_core, 'CORE_VERSION', '?')}")
+        st.caption(f"App 1.14.0 · kjerne {getattr(_core, 'CORE_VERSION', '?')}")
         st.markdown("""
         **Modell**
         - Fløter'n (start): t = 7670 / Q
@@ -2088,7 +2354,11 @@ def main():
         """)
         st.markdown("---")
         if st.button("🔄 Oppdater data"):
+            # Diskcachen må tømmes sammen med minnecachen - ellers leser
+            # wrapperne bare de samme svarene tilbake fra disk.
+            _core.clear_disk_cache()
             st.cache_data.clear()
+            st.cache_resource.clear()
             st.rerun()
         st.caption(
             f"Oppdatert {pd.Timestamp.now(tz='Europe/Oslo').strftime('%d.%m.%Y %H:%M')} | "